@@ -10,24 +10,1389 @@ import lzma
 import time
 import multiprocessing
 import shutil
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
+import threading
+import signal
+import ctypes
+import platform
+import json
+import fnmatch
+import argparse
+import tempfile
+import re
+import io
+import stat
+import csv
+import sqlite3
+import statistics
+import itertools
+import cProfile
+import random
+from collections import Counter, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+try:
+    import resource
+except ImportError:
+    resource = None
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QWidget, QLabel,
     QLineEdit, QPushButton, QFileDialog, QMessageBox, QTextEdit,
-    QHBoxLayout, QProgressBar, QListWidget, QListWidgetItem,
-    QTabWidget, QFrame
+    QHBoxLayout, QProgressBar, QListWidget, QListWidgetItem, QTableView, QHeaderView,
+    QTabWidget, QFrame, QCheckBox, QDialog, QSpinBox, QComboBox, QTreeWidget, QTreeWidgetItem
+)
+from PyQt5.QtCore import (
+    Qt, QThread, pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 
+# Opcionais: acesso aleatório em .tar.gz (pontos de checkpoint) e .tar.xz (índice de blocos)
+try:
+    import indexed_gzip
+except ImportError:
+    indexed_gzip = None
+try:
+    import xz as xz_seekable
+except ImportError:
+    xz_seekable = None
+# Opcional: utilização de CPU precisa para o controle de concorrência
+try:
+    import psutil
+except ImportError:
+    psutil = None
+# Opcionais: Zstandard (.zst) e LZ4 (.lz4)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
 # Centralize extensões suportadas
 ARCHIVE_EXTENSIONS = (
     '.zip', '.rar', '.7z',
     '.tar', '.gz', '.bz2', '.xz',
     '.tgz', '.tbz2', '.txz',
-    '.tar.gz', '.tar.bz2', '.tar.xz'
+    '.tar.gz', '.tar.bz2', '.tar.xz',
+    '.zst', '.lz4', '.tzst',
+    '.tar.zst', '.tar.lz4'
+)
+
+# Manifesto gravado dentro de cada pasta extracted_* (usado na extração incremental)
+MANIFEST_NAME = ".extrator_manifest.json"
+
+SEVEN_ZIP_PATH = "C:\\Program Files\\7-Zip\\7z.exe"
+# Fora do Windows o 7-Zip é procurado no PATH por estes nomes
+SEVEN_ZIP_NAMES = ("7z", "7zz", "7za")
+
+# Índice de membros (modo de navegação sem extração), gravado ao lado do arquivo
+INDEX_SUFFIX = ".extrator_index.json"
+# Checkpoints do descompressor gzip (indexed_gzip), um a cada GZIP_CHECKPOINT_SPACING bytes
+CHECKPOINT_SUFFIX = ".extrator_gzindex"
+GZIP_CHECKPOINT_SPACING = 4 * 1024 * 1024
+
+# ZIPs internos precisam de acesso aleatório: ficam em memória até este limite
+NESTED_SPOOL_LIMIT = 256 * 1024 * 1024
+
+# Configuração opcional por pasta de backup (ex.: {"include": ["*.sql"], "exclude": ["*.tmp"]})
+FOLDER_CONFIG_NAME = ".extrator.json"
+
+
+def parse_patterns(text):
+    """Converte "*.sql; *.bak" (separados por ; ou ,) em lista de padrões glob."""
+    return [p.strip() for p in text.replace(',', ';').split(';') if p.strip()]
+
+
+def matches_patterns(name, include, exclude):
+    """Indica se o membro passa pelos filtros de inclusão/exclusão (caminho completo ou nome)."""
+    name = name.replace('\\', '/')
+    base = name.rsplit('/', 1)[-1]
+
+    def hit(patterns):
+        return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(base, p) for p in patterns)
+
+    if include and not hit(include):
+        return False
+    return not (exclude and hit(exclude))
+
+
+# Assinaturas (formato, deslocamento, bytes mágicos) usadas na detecção de formato
+FORMAT_SIGNATURES = [
+    ('zip', 0, b'PK\x03\x04'),
+    ('zip', 0, b'PK\x05\x06'),
+    ('rar', 0, b'Rar!\x1a\x07'),
+    ('7z', 0, b'7z\xbc\xaf\x27\x1c'),
+    ('xz', 0, b'\xfd7zXZ\x00'),
+    ('gz', 0, b'\x1f\x8b'),
+    ('bz2', 0, b'BZh'),
+    ('zst', 0, b'\x28\xb5\x2f\xfd'),
+    ('lz4', 0, b'\x04\x22\x4d\x18'),
+    ('tar', 257, b'ustar'),
+]
+SNIFF_SIZE = 4096
+
+# Janela máxima aceita na descompressão zstd (backups gerados com --long)
+ZSTD_MAX_WINDOW = 2 ** 31
+
+
+def zstd_open(source, mode='rb'):
+    """Abre um fluxo Zstandard para leitura (caminho ou objeto de arquivo)."""
+    if zstandard is None:
+        raise Exception("Suporte a Zstandard requer: pip install zstandard")
+    dctx = zstandard.ZstdDecompressor(max_window_size=ZSTD_MAX_WINDOW)
+    return zstandard.open(source, mode, dctx=dctx)
+
+
+def lz4_open(source, mode='rb'):
+    """Abre um fluxo LZ4 (frame) para leitura (caminho ou objeto de arquivo)."""
+    if lz4_frame is None:
+        raise Exception("Suporte a LZ4 requer: pip install lz4")
+    return lz4_frame.open(source, mode)
+
+
+# Compactações de fluxo único: se o conteúdo for um TAR, o formato vira "tar.<fmt>"
+STREAM_OPENERS = {
+    'gz': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+    'zst': zstd_open,
+    'lz4': lz4_open,
+}
+# Extensões curtas de tar compactado que reaproveitam os descompactadores acima
+STREAM_ALIASES = {'tgz': 'gz', 'tbz2': 'bz2', 'txz': 'xz', 'tzst': 'zst'}
+
+# Formato por extensão, usado quando os bytes mágicos não são reconhecidos
+EXTENSION_FORMATS = [
+    ('.tar.gz', 'tar.gz'), ('.tar.bz2', 'tar.bz2'), ('.tar.xz', 'tar.xz'),
+    ('.tar.zst', 'tar.zst'), ('.tar.lz4', 'tar.lz4'),
+    ('.tgz', 'tar.gz'), ('.tbz2', 'tar.bz2'), ('.txz', 'tar.xz'), ('.tzst', 'tar.zst'),
+    ('.tar', 'tar'), ('.zip', 'zip'), ('.rar', 'rar'), ('.7z', '7z'),
+    ('.gz', 'gz'), ('.bz2', 'bz2'), ('.xz', 'xz'), ('.zst', 'zst'), ('.lz4', 'lz4'),
+]
+
+# Registro de formatos: nome -> função(extractor, archive_path, output_folder, options)
+FORMAT_HANDLERS = {}
+
+
+def register_format(*names):
+    """Decorador que registra a função de extração de um ou mais formatos."""
+    def decorator(func):
+        for name in names:
+            FORMAT_HANDLERS[name] = func
+        return func
+    return decorator
+
+
+def sniff_format(path):
+    """Identifica o formato pelos primeiros bytes; recorre à extensão se não reconhecer."""
+    with open(path, 'rb') as f:
+        head = f.read(SNIFF_SIZE)
+    fmt = None
+    for name, offset, magic in FORMAT_SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            fmt = name
+            break
+    if fmt in STREAM_OPENERS:
+        try:
+            with STREAM_OPENERS[fmt](path, 'rb') as f:
+                if f.read(512)[257:262] == b'ustar':
+                    fmt = 'tar.' + fmt
+        except Exception:
+            pass
+    if fmt is None:
+        lower = path.lower()
+        fmt = next((f for ext, f in EXTENSION_FORMATS if lower.endswith(ext)), None)
+    return fmt
+
+
+# Volumes de arquivos divididos: nome.7z.001, nome.part1.rar, nome.z01, nome.r00
+VOLUME_PATTERNS = [
+    # (regex, formato do grupo, função que calcula a ordem do volume)
+    (re.compile(r'^(?P<base>.+)\.part(?P<num>\d+)\.rar$', re.I), '.rar', lambda m: int(m.group('num'))),
+    (re.compile(r'^(?P<base>.+?)(?P<ext>(?:\.tar)?\.(?:7z|zip|rar|tar|gz|tgz|bz2|xz|zst|lz4))\.(?P<num>\d{3})$', re.I),
+     None, lambda m: int(m.group('num'))),
+    (re.compile(r'^(?P<base>.+)\.z(?P<num>\d{2})$', re.I), '.zip', lambda m: int(m.group('num'))),
+    (re.compile(r'^(?P<base>.+)\.r(?P<num>\d{2})$', re.I), '.rar', lambda m: int(m.group('num')) + 1),
+]
+# O .zip de um ZIP dividido é o último volume; o .rar de um RAR antigo (.r00) é o primeiro
+VOLUME_MAIN_ORDER = {'.zip': 10 ** 6, '.rar': 0}
+# Leitura sequencial dos volumes: buffer do fluxo e quanto pré-carregar do próximo volume
+VOLUME_READ_BUFFER = 8 * 1024 * 1024
+VOLUME_READ_AHEAD = 64 * 1024 * 1024
+
+
+def volume_info(filename):
+    """Retorna (chave do grupo, ordem) se o nome for um volume de arquivo dividido."""
+    for pattern, group_ext, order in VOLUME_PATTERNS:
+        m = pattern.match(filename)
+        if m:
+            ext = group_ext or m.group('ext')
+            return (m.group('base') + ext).lower(), order(m)
+    return None
+
+
+def is_archive_name(filename):
+    """Indica se o nome é um arquivo compactado (ou volume de um)."""
+    return filename.lower().endswith(ARCHIVE_EXTENSIONS) or volume_info(filename) is not None
+
+
+def group_volumes(folder, names=None):
+    """Agrupa os arquivos compactados da pasta em arquivos lógicos.
+
+    Retorna uma lista de listas de caminhos, cada uma ordenada pelo volume;
+    o primeiro caminho é o que deve ser entregue ao extrator. names evita
+    uma nova listagem quando os arquivos da pasta já são conhecidos.
+    """
+    if names is None:
+        names = [f for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f))]
+    groups = {}
+    for f in names:
+        path = os.path.join(folder, f)
+        info = volume_info(f)
+        if info is None:
+            if not f.lower().endswith(ARCHIVE_EXTENSIONS):
+                continue
+            ext = os.path.splitext(f)[1].lower()
+            info = (f.lower(), VOLUME_MAIN_ORDER.get(ext, 0))
+        groups.setdefault(info[0], []).append((info[1], path))
+    result = []
+    for key, volumes in groups.items():
+        volumes.sort()
+        paths = [p for _, p in volumes]
+        if key.endswith('.zip') and len(paths) > 1:
+            # ZIP dividido: o 7-Zip abre pelo .zip, que é o último volume
+            paths.insert(0, paths.pop())
+        result.append(paths)
+    return result
+
+
+class VolumeReader(io.RawIOBase):
+    """Lê os volumes de um arquivo dividido como um único fluxo sequencial.
+
+    No Linux o kernel é avisado (posix_fadvise) de que a leitura é sequencial e o
+    início do próximo volume já é pré-carregado, evitando idas e vindas no NAS.
+    """
+
+    def __init__(self, volumes):
+        super().__init__()
+        self.volumes = list(volumes)
+        self.index = -1
+        self.current = None
+        self._open_next()
+
+    def _open_next(self):
+        if self.current:
+            self.current.close()
+        self.index += 1
+        if self.index >= len(self.volumes):
+            self.current = None
+            return
+        self.current = open(self.volumes[self.index], 'rb', buffering=0)
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(self.current.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            if self.index + 1 < len(self.volumes):
+                fd = os.open(self.volumes[self.index + 1], os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, VOLUME_READ_AHEAD, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while self.current is not None:
+            n = self.current.readinto(b)
+            if n:
+                return n
+            self._open_next()
+        return 0
+
+    def close(self):
+        if self.current:
+            self.current.close()
+            self.current = None
+        super().close()
+
+
+def open_volumes(volumes):
+    """Abre um arquivo dividido como fluxo sequencial com buffer grande."""
+    return io.BufferedReader(VolumeReader(volumes), buffer_size=VOLUME_READ_BUFFER)
+
+
+def parse_since(text):
+    """Converte "AAAA-MM-DD" ou "AAAA-MM-DD HH:MM" em timestamp (None se vazio)."""
+    text = text.strip()
+    if not text:
+        return None
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida: {text} (use AAAA-MM-DD ou AAAA-MM-DD HH:MM)")
+
+
+# Controle adaptativo de concorrência (AIMD): amostragem e limiares
+CONTROLLER_INTERVAL = 2.0
+CONTROLLER_GAIN = 0.05
+CONTROLLER_LOSS = 0.10
+CONTROLLER_DECREASE = 0.5
+CONTROLLER_CPU_CEILING = 0.90
+
+
+def cpu_utilization():
+    """Utilização de CPU do sistema entre 0 e 1 (psutil, ou load average como aproximação)."""
+    if psutil is not None:
+        return psutil.cpu_percent(None) / 100
+    if hasattr(os, 'getloadavg'):
+        return min(os.getloadavg()[0] / multiprocessing.cpu_count(), 1.0)
+    return 0.0
+
+
+class ThroughputMeter:
+    """Contador de bytes compartilhado por todas as extrações em andamento."""
+
+    def __init__(self):
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def add(self, n):
+        with self.lock:
+            self.total += n
+
+
+# Instantâneos de progresso enviados à interface: no máximo 10 por segundo
+PROGRESS_INTERVAL = 0.1
+
+
+class ProgressAggregator:
+    """Consolida eventos por membro (bytes, arquivos, nome atual) em instantâneos.
+
+    Os backends chamam add() a cada bloco ou membro extraído; o callback
+    recebe um dicionário no máximo a cada PROGRESS_INTERVAL segundos, de
+    modo que a interface só redesenha instantâneos e nunca eventos individuais.
+    """
+
+    def __init__(self, callback, interval=PROGRESS_INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.bytes = 0
+            self.files = 0
+            self.current = ""
+            self.percent = 0
+            self.eta = ""
+            self.last_emit = 0.0
+            self.last_bytes = 0
+
+    def add(self, nbytes=0, nfiles=0, name=None):
+        with self.lock:
+            self.bytes += nbytes
+            self.files += nfiles
+            if name:
+                self.current = name
+        self.flush()
+
+    def update(self, percent, eta):
+        with self.lock:
+            self.percent = percent
+            self.eta = eta
+        self.flush()
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        # Verificação sem trava: a maioria das chamadas termina aqui
+        if not force and now - self.last_emit < self.interval:
+            return
+        with self.lock:
+            elapsed = now - self.last_emit
+            if not force and elapsed < self.interval:
+                return
+            rate = (self.bytes - self.last_bytes) / elapsed if self.last_emit and elapsed > 0 else 0
+            snapshot = {
+                "percent": self.percent,
+                "eta": self.eta,
+                "bytes": self.bytes,
+                "files": self.files,
+                "current": self.current,
+                "rate": rate,
+            }
+            self.last_emit = now
+            self.last_bytes = self.bytes
+        self.callback(snapshot)
+
+
+class CountingReader:
+    """Envolve um arquivo aberto contabilizando no medidor os bytes lidos."""
+
+    def __init__(self, f, meter):
+        self.f = f
+        self.meter = meter
+
+    def read(self, size=-1):
+        data = self.f.read(size)
+        self.meter.add(len(data))
+        return data
+
+    def readinto(self, b):
+        n = self.f.readinto(b)
+        self.meter.add(n or 0)
+        return n
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.f.close()
+
+
+# Estimativa de tempo: o histórico de execuções (RunHistory) calibra os formatos
+# Peso máximo (em execuções equivalentes) do histórico frente às medições atuais
+ETA_HISTORY_WEIGHT = 0.5
+ETA_CONFIDENCE_Z = 1.96
+
+
+def format_duration(seconds):
+    if seconds > 3600:
+        return f"{seconds/3600:.1f} horas"
+    if seconds > 60:
+        return f"{seconds/60:.1f} minutos"
+    return f"{seconds:.0f} segundos"
+
+
+class EtaEstimator:
+    """Tempo restante ponderado pelos bytes compactados de cada job.
+
+    Cada formato é calibrado pela razão segundos/byte observada (média
+    ponderada pelo tamanho, com variância para a faixa de confiança). Formatos
+    ainda sem medição usam a média geral com incerteza dobrada. O histórico
+    de execuções anteriores entra como medição inicial com peso reduzido.
+    """
+
+    def __init__(self, jobs, history=None):
+        self.lock = threading.Lock()
+        # job (arquivo) -> (formato, bytes)
+        self.jobs = dict(jobs)
+        self.total = sum(size for _, size in self.jobs.values()) or 1
+        self.done = set()
+        self.completed_bytes = 0
+        # formato -> [bytes, segundos, soma de segundos²/byte]
+        self.stats = {}
+        for fmt, (weight, seconds, squares) in (history or {}).items():
+            self.stats[fmt] = [weight * ETA_HISTORY_WEIGHT, seconds * ETA_HISTORY_WEIGHT, squares * ETA_HISTORY_WEIGHT]
+
+    def observe(self, job, seconds=None):
+        """Marca o job como concluído; seconds (só em sucessos) calibra o formato."""
+        fmt, size = self.jobs[job]
+        with self.lock:
+            self.done.add(job)
+            self.completed_bytes += size
+            if seconds is None or size <= 0:
+                return
+            entry = self.stats.setdefault(fmt, [0, 0.0, 0.0])
+            entry[0] += size
+            entry[1] += seconds
+            entry[2] += seconds * seconds / size
+
+    def rate(self, fmt):
+        """(segundos/byte, desvio padrão) do formato; None sem nenhuma medição."""
+        entry = self.stats.get(fmt)
+        if entry and entry[0] > 0:
+            mean = entry[1] / entry[0]
+            return mean, max(entry[2] / entry[0] - mean * mean, 0) ** 0.5
+        weight = sum(e[0] for e in self.stats.values())
+        if weight <= 0:
+            return None
+        mean = sum(e[1] for e in self.stats.values()) / weight
+        squares = sum(e[2] for e in self.stats.values()) / weight
+        return mean, 2 * max(squares - mean * mean, 0) ** 0.5 + mean / 2
+
+    def estimate(self, bytes_done, parallelism):
+        """(percentual de bytes, segundos restantes, mínimo, máximo); tempos None sem calibração."""
+        with self.lock:
+            done_bytes = min(max(bytes_done, self.completed_bytes), self.total)
+            percent = int(done_bytes / self.total * 100)
+            remaining = {}
+            for job, (fmt, size) in self.jobs.items():
+                if job not in self.done:
+                    remaining[fmt] = remaining.get(fmt, 0) + size
+            seconds = variance = 0.0
+            for fmt, size in remaining.items():
+                rate = self.rate(fmt)
+                if rate is None:
+                    return percent, None, None, None
+                seconds += size * rate[0]
+                variance += (size * rate[1]) ** 2
+        # Parte dos jobs em andamento já foi lida
+        pending = self.total - self.completed_bytes
+        factor = (self.total - done_bytes) / pending if pending > 0 else 0
+        parallelism = max(parallelism, 1)
+        eta = seconds * factor / parallelism
+        band = ETA_CONFIDENCE_Z * variance ** 0.5 * factor / parallelism
+        return percent, eta, max(eta - band, 0), eta + band
+
+
+# Histórico de execuções (SQLite na pasta raiz)
+HISTORY_DB_NAME = ".extrator_historico.sqlite"
+HISTORY_WINDOW_DAYS = 30
+HISTORY_THRESHOLD = 0.25
+# Abaixo disso as variações de duração/vazão são ruído e não geram alerta
+HISTORY_MIN_SECONDS = 1.0
+
+
+class RunHistory:
+    """Resultados de todas as execuções por pasta, para tendências, agendamento e ETA.
+
+    A conexão SQLite pertence à thread que a criou; cada execução abre a sua.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                run_id TEXT, finished_at TEXT, folder TEXT, archive TEXT,
+                format TEXT, backend TEXT, status TEXT, error_class TEXT,
+                original_bytes INTEGER, extracted_bytes INTEGER, files INTEGER,
+                seconds REAL, mb_s REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_folder ON results (folder, finished_at)")
+        self.conn.commit()
+
+    def record(self, run_id, result, size):
+        seconds = result.get("processing_seconds")
+        self.conn.execute(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                run_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), result.get("folder"),
+                result.get("latest_archive"), result.get("format"), result.get("backend"),
+                result["status"], result.get("error_class"), size, result.get("extracted_bytes"),
+                result.get("extracted_files"), seconds,
+                round(size / (1024 * 1024) / seconds, 3) if seconds and size else None,
+            )
+        )
+        self.conn.commit()
+
+    def since(self, days):
+        return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+
+    def format_stats(self, days=HISTORY_WINDOW_DAYS):
+        """formato -> [bytes, segundos, soma de segundos²/byte] no formato do EtaEstimator."""
+        rows = self.conn.execute("""
+            SELECT format, SUM(original_bytes), SUM(seconds), SUM(seconds * seconds / original_bytes)
+            FROM results
+            WHERE status = 'Sucesso' AND original_bytes > 0 AND seconds > 0 AND finished_at >= ?
+            GROUP BY format
+        """, (self.since(days),))
+        return {fmt: [weight, seconds, squares] for fmt, weight, seconds, squares in rows if fmt}
+
+    def folder_rates(self, days=HISTORY_WINDOW_DAYS):
+        """pasta -> segundos/byte da extração bem-sucedida mais recente."""
+        rows = self.conn.execute("""
+            SELECT folder, seconds / original_bytes FROM results
+            WHERE status = 'Sucesso' AND original_bytes > 0 AND seconds > 0 AND finished_at >= ?
+            ORDER BY finished_at
+        """, (self.since(days),))
+        return dict(rows)
+
+    def trends(self, days=HISTORY_WINDOW_DAYS, threshold=HISTORY_THRESHOLD):
+        """Compara a última execução de cada pasta com a mediana das anteriores na janela.
+
+        Retorna dicionários com as medianas, os valores atuais e os alertas
+        (queda de MB/s, aumento de duração e crescimento do arquivo).
+        """
+        rows = self.conn.execute("""
+            SELECT folder, original_bytes, seconds, mb_s FROM results
+            WHERE status = 'Sucesso' AND seconds > 0 AND finished_at >= ?
+            ORDER BY finished_at
+        """, (self.since(days),))
+        by_folder = {}
+        for folder, size, seconds, mb_s in rows:
+            by_folder.setdefault(folder, []).append((size or 0, seconds, mb_s or 0))
+        report = []
+        for folder, runs in sorted(by_folder.items()):
+            size, seconds, mb_s = runs[-1]
+            entry = {"folder": folder, "runs": len(runs), "size": size, "seconds": seconds, "mb_s": mb_s, "alerts": []}
+            if len(runs) > 1:
+                previous = runs[:-1]
+                entry["median_size"] = statistics.median(r[0] for r in previous)
+                entry["median_seconds"] = statistics.median(r[1] for r in previous)
+                entry["median_mb_s"] = statistics.median(r[2] for r in previous)
+                timed = max(seconds, entry["median_seconds"]) >= HISTORY_MIN_SECONDS
+                if timed and entry["median_mb_s"] and mb_s < entry["median_mb_s"] * (1 - threshold):
+                    entry["alerts"].append("regressão de vazão")
+                if timed and seconds > entry["median_seconds"] * (1 + threshold):
+                    entry["alerts"].append("duração maior")
+                if entry["median_size"] and size > entry["median_size"] * (1 + threshold):
+                    entry["alerts"].append("crescimento")
+            report.append(entry)
+        return report
+
+    def extracted_sizes(self):
+        """(pasta, nome da pasta extracted_*) -> bytes extraídos na execução mais recente."""
+        rows = self.conn.execute("""
+            SELECT folder, archive, extracted_bytes FROM results
+            WHERE status = 'Sucesso' AND extracted_bytes IS NOT NULL ORDER BY finished_at
+        """)
+        return {
+            (folder, "extracted_" + os.path.splitext(archive)[0]): size
+            for folder, archive, size in rows if archive
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+class ConcurrencyController:
+    """Ajusta o número de jobs simultâneos pela vazão medida (AIMD).
+
+    A cada CONTROLLER_INTERVAL segundos compara a vazão agregada com a amostra
+    anterior: se o último aumento trouxe ganho e a CPU tem folga, soma um job;
+    se a vazão caiu ou a CPU saturou, recua multiplicativamente; caso contrário
+    mantém. Assim o número de jobs se acomoda no joelho da curva de vazão.
+    Os workers por arquivo (membros RAR, threads do 7-Zip) dividem os núcleos
+    entre os jobs ativos.
+    """
+
+    def __init__(self, meter, max_jobs, fixed_jobs=0):
+        self.meter = meter
+        self.max_jobs = max(1, max_jobs)
+        self.fixed = fixed_jobs > 0
+        self.job_limit = min(fixed_jobs, self.max_jobs) if self.fixed else 1
+        self.last_rate = None
+        self.last_total = meter.total
+        self.last_time = time.time()
+        self.rate = 0.0
+
+    @property
+    def member_limit(self):
+        return max(1, multiprocessing.cpu_count() // self.job_limit)
+
+    def sample(self):
+        """Registra uma amostra se o intervalo já passou; retorna True se amostrou."""
+        now = time.time()
+        elapsed = now - self.last_time
+        if elapsed < CONTROLLER_INTERVAL:
+            return False
+        total = self.meter.total
+        self.rate = (total - self.last_total) / elapsed
+        self.last_total, self.last_time = total, now
+        if self.fixed:
+            return True
+        cpu = cpu_utilization()
+        if self.last_rate is None or (self.rate > self.last_rate * (1 + CONTROLLER_GAIN) and cpu < CONTROLLER_CPU_CEILING):
+            self.job_limit = min(self.job_limit + 1, self.max_jobs)
+        elif self.rate < self.last_rate * (1 - CONTROLLER_LOSS) or cpu >= CONTROLLER_CPU_CEILING:
+            self.job_limit = max(1, int(self.job_limit * CONTROLLER_DECREASE))
+        self.last_rate = self.rate
+        return True
+
+
+# Limite de E/S: tamanho dos blocos de cópia e rajada máxima acumulada pelo token bucket
+COPY_CHUNK = 1024 * 1024
+THROTTLE_BURST_SECONDS = 1.0
+
+
+def parse_clock(text):
+    """Converte "HH:MM" em datetime.time; "24:00" marca o fim do dia."""
+    text = text.strip()
+    if text == '24:00':
+        return datetime.max.time()
+    return datetime.strptime(text, '%H:%M').time()
+
+
+def parse_schedule(text):
+    """Converte "08:00-18:00=50/500; *=200" em janelas (início, fim, MB/s, arquivos/s).
+
+    Fora das janelas não há limite; "*" vale o dia inteiro e 0 desativa o limite.
+    """
+    schedule = []
+    for entry in text.split(';'):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            window, limits = entry.split('=', 1)
+            mb_per_s, _, files_per_s = limits.partition('/')
+            if window.strip() == '*':
+                start, end = parse_clock('00:00'), parse_clock('24:00')
+            else:
+                start, end = (parse_clock(t) for t in window.split('-', 1))
+            schedule.append((start, end, float(mb_per_s or 0), float(files_per_s or 0)))
+        except ValueError:
+            raise ValueError(f"Janela de limite inválida: {entry} (use HH:MM-HH:MM=MB/s[/arquivos/s])")
+    return schedule
+
+
+class TokenBucket:
+    """Token bucket com reserva: quem consome além do saldo recebe o tempo de espera."""
+
+    def __init__(self):
+        self.tokens = 0.0
+        self.last = time.time()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount, rate):
+        with self.lock:
+            now = time.time()
+            self.tokens = min(rate * THROTTLE_BURST_SECONDS, self.tokens + (now - self.last) * rate)
+            self.last = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / rate)
+
+
+class RateLimiter:
+    """Limite de vazão (MB/s) e de arquivos/s compartilhado por todos os extratores."""
+
+    def __init__(self, schedule=()):
+        self.schedule = list(schedule)
+        self.bytes = TokenBucket()
+        self.files = TokenBucket()
+
+    def limits(self):
+        """Limites (bytes/s, arquivos/s) da janela atual; 0 = sem limite."""
+        now = datetime.now().time()
+        for start, end, mb_per_s, files_per_s in self.schedule:
+            inside = start <= now < end if start <= end else (now >= start or now < end)
+            if inside:
+                return mb_per_s * 1024 * 1024, files_per_s
+        return 0, 0
+
+    def active(self):
+        return any(self.limits())
+
+    def reserve(self, nbytes=0, nfiles=0):
+        """Reserva a cota e retorna quantos segundos é preciso esperar."""
+        byte_rate, file_rate = self.limits()
+        delay = 0.0
+        if byte_rate and nbytes:
+            delay = self.bytes.reserve(nbytes, byte_rate)
+        if file_rate and nfiles:
+            delay = max(delay, self.files.reserve(nfiles, file_rate))
+        return delay
+
+    def throttle(self, nbytes=0, nfiles=0):
+        if not self.schedule:
+            return
+        delay = self.reserve(nbytes, nfiles)
+        if delay > 0:
+            time.sleep(delay)
+
+    def command_prefix(self):
+        """Prefixo para processos externos em janelas limitadas (classe de E/S baixa no Linux)."""
+        if sys.platform.startswith('linux') and self.active() and shutil.which('ionice'):
+            return ['ionice', '-c2', '-n7']
+        return []
+
+
+def suspend_process(process, seconds):
+    """Pausa um processo externo pelo tempo indicado (usado para limitar o 7-Zip)."""
+    if hasattr(signal, 'SIGSTOP'):
+        os.kill(process.pid, signal.SIGSTOP)
+        try:
+            time.sleep(seconds)
+        finally:
+            os.kill(process.pid, signal.SIGCONT)
+    elif psutil is not None:
+        proc = psutil.Process(process.pid)
+        proc.suspend()
+        try:
+            time.sleep(seconds)
+        finally:
+            proc.resume()
+    else:
+        time.sleep(seconds)
+
+
+# Perfis de prioridade: nice e classe de E/S (Linux/Unix) e classe de prioridade do Windows
+PRIORITY_PROFILES = {
+    'alta': {'nice': -5, 'ioclass': 'best-effort', 'iolevel': 0, 'windows': 'HIGH_PRIORITY_CLASS'},
+    'normal': {'nice': 0, 'ioclass': None, 'iolevel': None, 'windows': 'NORMAL_PRIORITY_CLASS'},
+    'baixa': {'nice': 10, 'ioclass': 'best-effort', 'iolevel': 7, 'windows': 'BELOW_NORMAL_PRIORITY_CLASS'},
+    'ociosa': {'nice': 19, 'ioclass': 'idle', 'iolevel': None, 'windows': 'IDLE_PRIORITY_CLASS'},
+}
+# "alta" mantém o comportamento histórico do 7-Zip (HIGH_PRIORITY_CLASS no Windows)
+DEFAULT_PRIORITY = 'alta'
+IOPRIO_CLASSES = {'realtime': 1, 'best-effort': 2, 'idle': 3}
+# Número da syscall ioprio_set por arquitetura (Linux)
+IOPRIO_SET_SYSCALL = {'x86_64': 251, 'aarch64': 30, 'i386': 289, 'i686': 289, 'armv7l': 314}
+# Afinidade: sched_setaffinity no Linux; no Windows (e BSD) só com psutil
+CPU_AFFINITY_AVAILABLE = hasattr(os, 'sched_setaffinity') or (
+    psutil is not None and hasattr(psutil.Process, 'cpu_affinity')
+)
+
+
+def find_seven_zip():
+    """Caminho do executável do 7-Zip (instalação padrão no Windows ou PATH)."""
+    if os.path.exists(SEVEN_ZIP_PATH):
+        return SEVEN_ZIP_PATH
+    for name in SEVEN_ZIP_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise Exception(f"7-Zip não encontrado em {SEVEN_ZIP_PATH} nem no PATH")
+
+
+def parse_cpu_list(text):
+    """Converte "0-3,6" no conjunto {0, 1, 2, 3, 6} (None se vazio)."""
+    text = text.strip()
+    if not text:
+        return None
+    if not CPU_AFFINITY_AVAILABLE:
+        raise ValueError("Afinidade de CPU indisponível nesta plataforma (instale o psutil)")
+    cpus = set()
+    try:
+        for part in text.split(','):
+            start, _, end = part.strip().partition('-')
+            cpus.update(range(int(start), int(end or start) + 1))
+    except ValueError:
+        raise ValueError(f"Lista de CPUs inválida: {text} (use, por exemplo, 0-3,6)")
+    return cpus
+
+
+def set_io_priority(pid, ioclass, level=None):
+    """Define a classe de E/S (ionice) de um processo/thread no Linux; pid 0 = thread atual."""
+    number = IOPRIO_SET_SYSCALL.get(platform.machine())
+    if not sys.platform.startswith('linux') or number is None or ioclass not in IOPRIO_CLASSES:
+        return
+    value = (IOPRIO_CLASSES[ioclass] << 13) | (level or 0)
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.syscall(number, 1, pid, value)  # IOPRIO_WHO_PROCESS
+
+
+def apply_priority(pid, profile, cpus=None, io=True):
+    """Aplica nice, classe de E/S e afinidade de CPU; pid 0 = thread atual.
+
+    No Linux nice, ionice e afinidade são por thread e herdados por threads e
+    processos criados depois (workers, unrar), por isso basta aplicá-los na
+    thread da extração. No Windows não há equivalente por thread: com psutil,
+    a classe de prioridade e a afinidade valem para o processo inteiro (o
+    7-Zip já nasce com a classe via popen_priority_kwargs). Falta de permissão
+    (ex.: nice negativo) é ignorada.
+    """
+    settings = PRIORITY_PROFILES[profile]
+    if sys.platform == 'win32':
+        if psutil is None:
+            return
+        try:
+            proc = psutil.Process(pid or os.getpid())
+            if pid == 0:
+                proc.nice(getattr(psutil, settings['windows']))
+            if cpus:
+                proc.cpu_affinity(sorted(cpus))
+        except (psutil.Error, OSError, ValueError):
+            pass
+        return
+    if hasattr(os, 'setpriority') and settings['nice']:
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, settings['nice'])
+        except OSError:
+            pass
+    if io and settings['ioclass']:
+        set_io_priority(pid, settings['ioclass'], settings['iolevel'])
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(pid, cpus)
+        except OSError:
+            pass
+
+
+def popen_priority_kwargs(profile):
+    """Argumentos do Popen para esconder a janela e definir a prioridade no Windows."""
+    if sys.platform != 'win32':
+        return {}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return {
+        "startupinfo": startupinfo,
+        "creationflags": subprocess.CREATE_NO_WINDOW | getattr(subprocess, PRIORITY_PROFILES[profile]['windows'])
+    }
+
+
+# Métricas no formato de exposição do Prometheus/OpenMetrics
+METRICS_DURATION_BUCKETS = (1, 5, 15, 60, 300, 900, 3600, 14400)
+METRICS_DEFINITIONS = {
+    "extrator_bytes_in_total": ("counter", "Bytes compactados lidos"),
+    "extrator_bytes_out_total": ("counter", "Bytes gravados nas pastas extraídas"),
+    "extrator_files_extracted_total": ("counter", "Arquivos extraídos"),
+    "extrator_format_bytes_in_total": ("counter", "Bytes compactados lidos por formato"),
+    "extrator_format_seconds_total": ("counter", "Segundos de extração por formato"),
+    "extrator_jobs_total": ("counter", "Extrações concluídas por status"),
+    "extrator_failures_total": ("counter", "Extrações com erro por formato"),
+    "extrator_queue_depth": ("gauge", "Extrações aguardando na fila"),
+    "extrator_active_jobs": ("gauge", "Extrações em andamento"),
+    "extrator_concurrency_limit": ("gauge", "Limite atual de extrações simultâneas"),
+    "extrator_throughput_bytes_per_second": ("gauge", "Vazão agregada na última amostra"),
+    "extrator_job_duration_seconds": ("histogram", "Duração das extrações por pasta"),
+}
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for k, v in sorted(labels)
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class ExtractionMetrics:
+    """Contadores, medidores e histogramas da extração (thread-safe)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.values[(name, tuple(labels.items()))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(labels.items()))
+        with self.lock:
+            buckets, total, count = self.histograms.get(key, ([0] * len(METRICS_DURATION_BUCKETS), 0.0, 0))
+            buckets = [c + (value <= b) for c, b in zip(buckets, METRICS_DURATION_BUCKETS)]
+            self.histograms[key] = (buckets, total + value, count + 1)
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus."""
+        lines = []
+        with self.lock:
+            for name, (kind, help_text) in METRICS_DEFINITIONS.items():
+                samples = [(k, v) for k, v in self.values.items() if k[0] == name]
+                series = [(k, v) for k, v in self.histograms.items() if k[0] == name]
+                if not samples and not series:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for (_, labels), value in samples:
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+                for (_, labels), (buckets, total, count) in series:
+                    for bound, bucket_count in zip(METRICS_DURATION_BUCKETS, buckets):
+                        lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {bucket_count}")
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {count}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {total}")
+                    lines.append(f"{name}_count{format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Grava as métricas para o textfile collector do node_exporter (troca atômica)."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+def start_metrics_server(metrics, port):
+    """Expõe /metrics via HTTP numa thread em segundo plano."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') not in ('', '/metrics'):
+                self.send_error(404)
+                return
+            body = metrics.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('', port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Etapas medidas em cada extração (chave -> rótulo do relatório)
+STAGE_LABELS = {
+    "scan": "descoberta",
+    "plan": "planejamento",
+    "open": "abertura",
+    "verify": "verificação",
+    "decompress": "descompactação",
+    "write": "gravação",
+    "post-stats": "estatísticas",
+}
+
+
+class SpanRecorder:
+    """Spans por etapa da extração, exportáveis no formato Chrome trace.
+
+    Além dos eventos, acumula o tempo de cada etapa por job (thread-local)
+    para o relatório. A gravação é medida dentro da descompactação e
+    descontada dela ao fechar o job.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.events = []
+            self.origin = time.perf_counter()
+
+    def begin_job(self):
+        self.local.stages = {}
+
+    def end_job(self):
+        stages = getattr(self.local, 'stages', None) or {}
+        self.local.stages = None
+        if "write" in stages and "decompress" in stages:
+            stages["decompress"] = max(stages["decompress"] - stages["write"], 0)
+        return {stage: round(seconds, 3) for stage, seconds in stages.items()}
+
+    def add(self, stage, seconds):
+        stages = getattr(self.local, 'stages', None)
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0) + seconds
+
+    @contextmanager
+    def span(self, name, accumulate=True, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            if accumulate:
+                self.add(name, duration)
+            with self.lock:
+                self.events.append({
+                    "name": name,
+                    "cat": "extracao",
+                    "ph": "X",
+                    "ts": round((start - self.origin) * 1e6),
+                    "dur": round(duration * 1e6),
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": args,
+                })
+
+    def write_chrome_trace(self, path):
+        """Grava os eventos em JSON (chrome://tracing, Perfetto, speedscope)."""
+        with self.lock:
+            events = list(self.events)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+# Perfilamento opcional de cada extract_archive
+PROFILE_MODES = ("desligado", "cprofile", "amostragem")
+PROFILE_DIR_NAME = "perfis_extracao"
+PROFILE_SAMPLE_INTERVAL = 0.005
+
+
+class StackSampler:
+    """Profiler por amostragem: registra a pilha de uma thread a intervalos fixos.
+
+    O resultado é gravado no formato "collapsed" (pilha;separada;por;ponto-e-vírgula
+    contagem), aceito por flamegraph.pl, speedscope e similares.
+    """
+
+    def __init__(self, thread_id, interval=PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def sample(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def format_stages(stages):
+    """Linha legível com o tempo de cada etapa, na ordem do pipeline."""
+    return " | ".join(
+        f"{label} {stages[stage]:.2f}s" for stage, label in STAGE_LABELS.items() if stage in stages
+    )
+
+
+# Relatório: arquivos listados por pasta no visualizador e página da árvore de arquivos
+REPORT_NAME = "relatorio_extracao.txt"
+REPORT_PREVIEW_FILES = 20
+REPORT_PAGE_SIZE = 500
+
+
+def iter_extracted_names(output_folder):
+    """Nomes do primeiro nível da pasta extraída, lidos sob demanda (sem o manifesto)."""
+    try:
+        with os.scandir(output_folder) as it:
+            for entry in it:
+                if entry.name != MANIFEST_NAME:
+                    yield entry.name
+    except OSError:
+        return
+
+
+def report_section(key, data, max_files=None):
+    """Linhas do relatório de uma pasta.
+
+    Com max_files, a listagem é cortada na prévia guardada no resultado; sem
+    ele, os nomes são lidos da pasta extraída um a um.
+    """
+    status_icon = "✅" if data['status'] == 'Sucesso' else "❌"
+    yield f"\n📁 {os.path.basename(data.get('folder', key))}"
+    yield f"   {status_icon} Status: {data['status']}"
+    yield f"   📦 Arquivo mais recente: {data.get('latest_archive', 'N/A')}"
+    yield f"   🕒 Criado em: {data.get('latest_archive_ctime', 'N/A')}"
+    yield f"   🕒 Modificado em: {data.get('latest_archive_mtime', 'N/A')}"
+    yield f"   📦 Tamanho original: {data.get('original_size_mb', 0):.2f} MB"
+    yield f"   🗃️ Tamanho extraído: {data.get('extracted_size_mb', 0):.2f} MB"
+    yield f"   💬 Mensagem: {data['message']}"
+    yield f"   ⏱️ Tempo de processamento: {data.get('processing_time', 'N/A')}"
+    if data.get('stages'):
+        yield f"   🧭 Etapas: {format_stages(data['stages'])}"
+    if data.get('volumes', 1) > 1:
+        yield f"   🧩 Volumes: {data['volumes']}"
+    if data.get('reused_files'):
+        yield f"   ♻️ Reaproveitados da extração anterior: {data['reused_files']}"
+    if not data.get('files'):
+        return
+    yield "   📄 Arquivos extraídos:"
+    if max_files is None and data.get('output_folder'):
+        names = iter_extracted_names(data['output_folder'])
+    else:
+        names = data['files'][:max_files]
+    for name in names:
+        yield f"      - {name}"
+    hidden = data.get('files_total', len(data['files'])) - len(data['files'][:max_files])
+    if max_files is not None and hidden > 0:
+        yield f"      ... e mais {hidden} (lista completa em {REPORT_NAME})"
+
+
+# Fluxo estruturado de resultados (um registro por pasta/arquivo, anexado ao terminar)
+RESULTS_NAME = "resultados_extracao"
+RESULT_FIELDS = (
+    "run_id", "finished_at", "key", "folder", "status", "error_class", "message", "format", "backend",
+    "volumes", "latest_archive", "latest_archive_ctime", "latest_archive_mtime",
+    "original_size_mb", "extracted_size_mb", "extracted_bytes", "extracted_files", "reused_files",
+    "processing_seconds", "throughput_mb_s",
 )
+RESULT_STAGES = ("open", "verify", "decompress", "write", "post-stats")
+
+
+def format_backend(fmt, volumes=1):
+    """Biblioteca ou ferramenta que extrai o formato."""
+    if fmt == '7z' or (fmt == 'zip' and volumes > 1):
+        return "7-zip"
+    if fmt == 'zip':
+        return "zipfile"
+    if fmt == 'rar':
+        return "rarfile"
+    if fmt.startswith('tar'):
+        return "tarfile"
+    return "python"
+
+
+def error_class(exc):
+    """Categoria estável do erro para consumo por ferramentas (independe da mensagem)."""
+    message = str(exc).lower()
+    if "senha" in message or "password" in message:
+        return "senha"
+    if "não suportado" in message:
+        return "formato"
+    if "não encontrado" in message and "7-zip" in message:
+        return "ferramenta"
+    if isinstance(exc, OSError):
+        return "es"
+    return type(exc).__name__
+
+
+class ResultStreamWriter:
+    """Anexa cada resultado em JSON Lines e CSV assim que o job termina.
+
+    Os arquivos acumulam execuções (identificadas por run_id) e são
+    descarregados a cada linha, para leitura enquanto a execução continua.
+    """
+
+    def __init__(self, base_path, run_id):
+        self.run_id = run_id
+        self.jsonl_path = base_path + ".jsonl"
+        self.csv_path = base_path + ".csv"
+        new_csv = not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0
+        self.jsonl = open(self.jsonl_path, 'a', encoding='utf-8')
+        self.csv_file = open(self.csv_path, 'a', encoding='utf-8', newline='')
+        self.csv = csv.DictWriter(
+            self.csv_file, fieldnames=RESULT_FIELDS + tuple(f"stage_{s}_s" for s in RESULT_STAGES),
+            extrasaction='ignore'
+        )
+        if new_csv:
+            self.csv.writeheader()
+
+    def record(self, key, result):
+        seconds = result.get("processing_seconds")
+        row = {field: result.get(field) for field in RESULT_FIELDS}
+        row.update({
+            "run_id": self.run_id,
+            "finished_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "key": key,
+            "folder": result.get("folder", key),
+            "throughput_mb_s": round(result.get("original_size_mb", 0) / seconds, 2) if seconds else None,
+        })
+        stages = result.get("stages") or {}
+        self.jsonl.write(json.dumps(dict(row, stages=stages), ensure_ascii=False) + "\n")
+        self.jsonl.flush()
+        row.update({f"stage_{stage}_s": stages.get(stage) for stage in RESULT_STAGES})
+        self.csv.writerow(row)
+        self.csv_file.flush()
+
+    def close(self):
+        self.jsonl.close()
+        self.csv_file.close()
+
+
+class ReportWriter:
+    """Grava o relatório em disco à medida que os jobs terminam, com memória constante."""
+
+    def __init__(self, path, header):
+        self.path = path
+        self.file = open(path, 'w', encoding='utf-8')
+        self.count = 0
+        self.original_size = 0
+        self.extracted_size = 0
+        self.write(header)
+
+    def write(self, lines):
+        for line in lines:
+            self.file.write(line + "\n")
+        self.file.flush()
+
+    def add(self, key, data):
+        self.write(report_section(key, data))
+        self.count += 1
+        self.original_size += data.get('original_size_mb', 0)
+        self.extracted_size += data.get('extracted_size_mb', 0)
+
+    def summary(self):
+        return [
+            "\n" + "="*80,
+            f"ℹ️ Total de pastas processadas: {self.count}",
+            f"📊 Tamanho total original: {self.original_size:.2f} MB",
+            f"📦 Tamanho total extraído: {self.extracted_size:.2f} MB"
+        ]
+
+    def close(self, lines=()):
+        self.write(lines)
+        self.file.close()
+
+
+def strip_archive_extension(name):
+    """Remove a extensão de compactação (inclusive as duplas, como .tar.gz)."""
+    lower = name.lower()
+    for ext in sorted(ARCHIVE_EXTENSIONS, key=len, reverse=True):
+        if lower.endswith(ext):
+            return name[:-len(ext)]
+    return name
+
+
+def iter_archive_folders(root_folder):
+    """Gera, à medida que a varredura avança, as pastas com arquivos compactados."""
+    for root, dirs, files in os.walk(root_folder):
+        # Extrações em exclusão (lápides) não são percorridas
+        dirs[:] = [d for d in dirs if not d.startswith(TOMBSTONE_PREFIX)]
+        if any(is_archive_name(f) for f in files):
+            yield root
+
+
+def scan_archive_folders(root_folder):
+    """Varre a raiz numa única passagem (os.scandir) e gera (pasta, resumo).
+
+    O resumo traz o arquivo mais recente (caminho a extrair), o tamanho somado
+    dos seus volumes e a data de modificação, aproveitando o stat da listagem.
+    """
+    stack = [root_folder]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subfolders = []
+        stats = {}
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith(TOMBSTONE_PREFIX):
+                        subfolders.append(entry.path)
+                elif entry.is_file() and is_archive_name(entry.name):
+                    stats[entry.name] = entry.stat()
+            except OSError:
+                continue
+        # Ordem inversa na pilha: as subpastas saem na ordem da listagem
+        stack.extend(reversed(subfolders))
+        if not stats:
+            continue
+        groups = group_volumes(folder, list(stats))
+        mtimes = [max(stats[os.path.basename(p)].st_mtime for p in paths) for paths in groups]
+        latest = max(range(len(groups)), key=mtimes.__getitem__)
+        yield folder, {
+            "latest_archive": groups[latest][0],
+            "size": sum(stats[os.path.basename(p)].st_size for p in groups[latest]),
+            "mtime": mtimes[latest],
+        }
+
+
+def load_folder_config(folder):
+    """Lê o arquivo de configuração da pasta de backup, se existir.
+
+    include/exclude aceitam lista ou texto ("*.sql; *.bak") e são sempre
+    devolvidos como lista de padrões.
+    """
+    path = os.path.join(folder, FOLDER_CONFIG_NAME)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    for key in ("include", "exclude"):
+        if isinstance(config.get(key), str):
+            config[key] = parse_patterns(config[key])
+    return config
 
 APP_STYLE = """
 /* Main Window Styling */
@@ -181,7 +1546,7 @@ QProgressBar::chunk {
 }
 
 /* List Widget Styling */
-QListWidget {
+QListWidget, QTableView {
     background-color: #3A3A3A;
     border: 1px solid #444;
     border-radius: 4px;
@@ -190,17 +1555,17 @@ QListWidget {
     outline: 0;
 }
 
-QListWidget::item {
+QListWidget::item, QTableView::item {
     padding: 6px;
     border-bottom: 1px solid #444;
 }
 
-QListWidget::item:selected {
+QListWidget::item:selected, QTableView::item:selected {
     background-color: #4A6FA5;
     color: white;
 }
 
-QListWidget::item:hover {
+QListWidget::item:hover, QTableView::item:hover {
     background-color: #505050;
 }
 
@@ -213,67 +1578,240 @@ QFrame#separator {
 """
 
 class ExtractionThread(QThread):
-    update_progress = pyqtSignal(int, str)
+    # Instantâneo consolidado do ProgressAggregator (ver PROGRESS_INTERVAL)
+    update_progress = pyqtSignal(dict)
     update_status = pyqtSignal(str)
     extraction_done = pyqtSignal(dict)
+    # Resultado de cada pasta/arquivo assim que o job termina (chave, resultado)
+    job_done = pyqtSignal(str, dict)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.root_folder = ""
         self.password = ""
         self.selected_folders = None
+        self.incremental = False
+        self.include_patterns = []
+        self.exclude_patterns = []
+        self.nested_depth = 0
+        # Política de seleção: os N mais recentes por pasta ou todos desde uma data
+        self.archive_count = 1
+        self.archives_since = None
+        # Concorrência: 0 = controle adaptativo; > 0 = número fixo de jobs
+        self.fixed_jobs = 0
+        self.meter = ThroughputMeter()
+        self.controller = None
+        self.limiter = RateLimiter()
+        self.priority = DEFAULT_PRIORITY
+        self.cpu_affinity = None
+        self.metrics = ExtractionMetrics()
+        self.metrics_file = None
+        self.tracer = SpanRecorder()
+        self.run_stages = {}
+        self.trace_file = None
+        self.profile_mode = "desligado"
+        # Caminho base (sem extensão) dos fluxos .jsonl/.csv de resultados; None desativa
+        self.results_file = None
+        # Relatório em disco (ReportWriter): cada seção é gravada por esta thread, não pela interface
+        self.report_writer = None
+        # Política de retenção aplicada às pastas extracted_* ao fim de cada execução
+        self.retention = None
+        self.progress = ProgressAggregator(self.update_progress.emit)
+        # Histórico SQLite na raiz: alimenta agendamento e ETA e recebe os resultados
+        self.use_history = True
+        self.eta = None
+        self.format_cache = {}
         self.executor = ThreadPoolExecutor(max_workers=multiprocessing.cpu_count())
         self._is_running = True
 
+    def detect_format(self, archive_path):
+        """Formato do arquivo (detectado uma única vez por arquivo/mtime)."""
+        key = (archive_path, os.path.getmtime(archive_path))
+        if key not in self.format_cache:
+            self.format_cache[key] = sniff_format(archive_path)
+        return self.format_cache[key]
+
+    def copy_stream(self, src, dst):
+        """Copia um fluxo em blocos respeitando o limite de E/S da execução."""
+        while True:
+            chunk = src.read(COPY_CHUNK)
+            if not chunk:
+                break
+            self.limiter.throttle(len(chunk))
+            start = time.perf_counter()
+            dst.write(chunk)
+            self.tracer.add("write", time.perf_counter() - start)
+            self.progress.add(len(chunk))
+
+    @contextmanager
+    def profiled(self, folder, archive_path):
+        """Perfila o bloco conforme profile_mode e grava o resultado em perfis_extracao/."""
+        if self.profile_mode not in ("cprofile", "amostragem"):
+            yield
+            return
+        profiler = sampler = None
+        if self.profile_mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+: só um cProfile ativo por vez; os demais jobs são amostrados
+                profiler = None
+        if profiler is None:
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            else:
+                sampler.stop()
+            profile_dir = os.path.join(self.root_folder or os.path.dirname(folder), PROFILE_DIR_NAME)
+            relative = os.path.relpath(folder, self.root_folder) if self.root_folder else os.path.basename(folder)
+            base_name = re.sub(r'[^\w.-]+', '_', f"{relative}_{os.path.basename(archive_path)}").strip('_')
+            try:
+                os.makedirs(profile_dir, exist_ok=True)
+                if profiler:
+                    profiler.dump_stats(os.path.join(profile_dir, base_name + ".pstats"))
+                else:
+                    sampler.write_collapsed(os.path.join(profile_dir, base_name + ".collapsed"))
+            except OSError as e:
+                self.update_status.emit(f"Falha ao gravar o perfil: {e}")
+
+    def member_workers(self):
+        """Workers por arquivo (membros RAR, threads do 7-Zip) definidos pelo controlador."""
+        if self.controller is None:
+            return multiprocessing.cpu_count()
+        return self.controller.member_limit
+
     def find_archive_folders(self):
         """Retorna pastas que possuem arquivos compactados."""
-        return [
-            root for root, _, files in os.walk(self.root_folder)
-            if any(f.lower().endswith(ARCHIVE_EXTENSIONS) for f in files)
-        ]
+        return list(iter_archive_folders(self.root_folder))
 
     def find_latest_archive(self, folder):
-        """Retorna o arquivo compactado mais recente em uma pasta."""
-        valid_files = [
-            os.path.join(folder, f)
-            for f in os.listdir(folder)
-            if f.lower().endswith(ARCHIVE_EXTENSIONS)
-        ]
-        if not valid_files:
+        """Retorna o arquivo compactado mais recente em uma pasta.
+
+        Arquivos divididos em volumes contam como um só; o caminho retornado é o
+        do volume que deve ser entregue ao extrator.
+        """
+        groups = group_volumes(folder)
+        if not groups:
             return None
-        return max(valid_files, key=os.path.getmtime)
+        latest = max(groups, key=lambda paths: max(os.path.getmtime(p) for p in paths))
+        return latest[0]
+
+    def find_archives(self, folder):
+        """Retorna os arquivos da pasta selecionados pela política (mais recente primeiro).
+
+        Com archives_since definido, traz todos os arquivos modificados a partir
+        da data; caso contrário, os archive_count mais recentes.
+        """
+        stamped = sorted(
+            ((max(os.path.getmtime(p) for p in paths), paths[0]) for paths in group_volumes(folder)),
+            reverse=True
+        )
+        if self.archives_since is not None:
+            return [path for mtime, path in stamped if mtime >= self.archives_since]
+        return [path for _, path in stamped[:max(self.archive_count, 1)]]
+
+    def open_history(self):
+        """Histórico de execuções da raiz (None se desativado ou inacessível)."""
+        if not self.use_history or not self.root_folder:
+            return None
+        try:
+            return RunHistory(os.path.join(self.root_folder, HISTORY_DB_NAME))
+        except sqlite3.Error as e:
+            self.update_status.emit(f"Histórico indisponível: {e}")
+            return None
+
+    def update_eta(self, bytes_done, parallelism):
+        """Atualiza percentual (por bytes) e tempo restante com faixa de confiança."""
+        percent, eta, low, high = self.eta.estimate(bytes_done, parallelism)
+        if eta is None:
+            text = "Calculando tempo restante..."
+        else:
+            text = f"{format_duration(eta)} restantes (entre {format_duration(low)} e {format_duration(high)})"
+        self.progress.update(percent, text)
 
-    def extract_7z(self, archive_path, output_folder, password):
+    def plan_jobs(self, archive_folders, history=None):
+        """Monta a fila única de extrações de todas as pastas.
+
+        Cada job é (pasta, arquivo, tamanho total dos volumes). Os mais demorados
+        vão primeiro para que nenhum fique sozinho no fim da fila: com histórico,
+        a duração é estimada pela última vazão da pasta (ou do formato); sem
+        ele, pelo tamanho. Retorna (jobs, pastas sem arquivo válido).
+        """
+        jobs = []
+        skipped = []
+        for folder in archive_folders:
+            archives = self.find_archives(folder)
+            if not archives:
+                skipped.append(folder)
+                continue
+            for archive_path in archives:
+                size = sum(os.path.getsize(v) for v in self.archive_volumes(archive_path))
+                jobs.append((folder, archive_path, size))
+        jobs.sort(key=lambda job: job[2], reverse=True)
+        if history is None:
+            return jobs, skipped
+
+        folder_rates = history.folder_rates()
+        format_rates = {fmt: seconds / weight for fmt, (weight, seconds, _) in history.format_stats().items() if weight}
+        if not folder_rates and not format_rates:
+            return jobs, skipped
+        default_rate = statistics.median(format_rates.values()) if format_rates else statistics.median(folder_rates.values())
+
+        def expected_seconds(job):
+            folder, archive_path, size = job
+            rate = folder_rates.get(folder)
+            if rate is None:
+                try:
+                    rate = format_rates.get(self.detect_format(archive_path))
+                except OSError:
+                    rate = None
+            return size * (rate if rate is not None else default_rate)
+
+        jobs.sort(key=expected_seconds, reverse=True)
+        return jobs, skipped
+
+    def archive_volumes(self, archive_path):
+        """Todos os volumes do arquivo lógico ao qual o caminho pertence."""
+        folder = os.path.dirname(archive_path)
+        for paths in group_volumes(folder):
+            if archive_path in paths:
+                return paths
+        return [archive_path]
+
+    def extract_7z(self, archive_path, output_folder, password, include=(), exclude=()):
         """Extração otimizada usando 7-Zip via subprocess com progresso detalhado."""
-        seven_zip = "C:\\Program Files\\7-Zip\\7z.exe"
-        if not os.path.exists(seven_zip):
-            raise Exception("7-Zip não encontrado em C:\\Program Files\\7-Zip\\7z.exe")
+        seven_zip = find_seven_zip()
         cmd = [
             seven_zip, "x", archive_path,
-            f"-o{output_folder}", "-y", "-mmt=on", "-bb1", "-sccUTF-8"
+            f"-o{output_folder}", "-y", f"-mmt{self.member_workers()}", "-bb1", "-sccUTF-8"
         ]
         if password:
             cmd.extend([f"-p{password}", "-mhe=on"])
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        for pattern in include:
+            cmd.append(f"-ir!{pattern}")
+        for pattern in exclude:
+            cmd.append(f"-xr!{pattern}")
+        prefix = self.limiter.command_prefix()
+        cmd = prefix + cmd
 
         process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             stdin=subprocess.PIPE,
-            creationflags=(
-                subprocess.CREATE_NO_WINDOW |
-                subprocess.HIGH_PRIORITY_CLASS
-            ),
-            text=True
+            text=True,
+            **popen_priority_kwargs(self.priority)
         )
-
-        import threading
+        # Garante a prioridade mesmo quando chamado fora da thread de extração (ex.: GUI)
+        apply_priority(process.pid, self.priority, self.cpu_affinity, io=not prefix)
 
         def monitor_progress():
             last_size = 0
-            last_time = time.time()
             while process.poll() is None:
                 try:
                     current_size = sum(
@@ -281,14 +1819,12 @@ class ExtractionThread(QThread):
                         for root, _, files in os.walk(output_folder)
                         for f in files
                     )
-                    now = time.time()
-                    elapsed = now - last_time
-                    speed = (current_size - last_size) / (1024 * 1024) / elapsed if elapsed > 0 else 0
+                    # Limite de E/S: o 7-Zip é pausado enquanto a cota estiver estourada
+                    delay = self.limiter.reserve(current_size - last_size)
+                    if delay > 0:
+                        suspend_process(process, delay)
+                    self.progress.add(current_size - last_size)
                     last_size = current_size
-                    last_time = now
-                    self.update_status.emit(
-                        f"Extraindo... {current_size/(1024*1024):.1f}MB ({speed:.1f} MB/s)"
-                    )
                 except Exception:
                     pass
                 time.sleep(0.5)
@@ -296,21 +1832,10 @@ class ExtractionThread(QThread):
         t = threading.Thread(target=monitor_progress, daemon=True)
         t.start()
 
-        # Progresso detalhado por arquivo
-        total_files = 0
-        extracted_files = 0
-        file_names = []
-        file_name = ""
+        # Progresso por arquivo: consolidado pelo agregador (bytes vêm do monitor)
         for line in process.stdout:
             if line.startswith("- "):  # 7z -bb1 mostra arquivos assim
-                file_name = line.strip()[2:]
-                file_names.append(file_name)
-                total_files += 1
-            elif line.startswith("Extracting  "):
-                extracted_files += 1
-                percent = int((extracted_files / max(total_files, 1)) * 100)
-                self.update_progress.emit(percent, f"Extraindo: {file_name}")
-                self.update_status.emit(f"Extraindo: {file_name}")
+                self.progress.add(nfiles=1, name=line.strip()[2:])
 
         t.join(timeout=0.1)
 
@@ -325,114 +1850,604 @@ class ExtractionThread(QThread):
 
         return True
 
-    def extract_zip(self, archive_path, output_folder, password):
+    def extract_zip(self, archive_path, output_folder, password, member_filter=None, depth=0):
         """Extração otimizada para ZIP."""
+        with CountingReader(open(archive_path, 'rb'), self.meter) as source:
+            with zipfile.ZipFile(source) as zf:
+                self.extract_zip_members(zf, output_folder, password, member_filter, depth)
+
+    def extract_zip_members(self, zf, output_folder, password, member_filter=None, depth=0):
+        """Extrai os membros de um ZipFile já aberto (arquivo em disco ou aninhado)."""
+        pwd = password.encode() if password else None
         try:
-            with zipfile.ZipFile(archive_path) as zf:
-                for file in zf.infolist():
-                    target_path = os.path.join(output_folder, file.filename)
-                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                    with open(target_path, 'wb') as f:
-                        shutil.copyfileobj(
-                            zf.open(file, pwd=password.encode() if password else None), f
-                        )
+            for file in zf.infolist():
+                if member_filter and not member_filter(file.filename):
+                    continue
+                target_path = os.path.join(output_folder, file.filename)
+                if file.is_dir():
+                    os.makedirs(target_path, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                if depth > 0 and file.filename.lower().endswith(ARCHIVE_EXTENSIONS):
+                    with zf.open(file, pwd=pwd) as src:
+                        self.extract_stream(src, file.filename, os.path.dirname(target_path), depth - 1)
+                    continue
+                self.limiter.throttle(nfiles=1)
+                self.progress.add(nfiles=1, name=file.filename)
+                with zf.open(file, pwd=pwd) as src, open(target_path, 'wb') as f:
+                    self.copy_stream(src, f)
         except RuntimeError as e:
             if "password required" in str(e).lower() or "Bad password" in str(e):
                 raise Exception("Arquivo ZIP protegido por senha. Por favor, informe a senha correta.")
             raise
 
-    def extract_rar(self, archive_path, output_folder, password):
+    def extract_rar(self, archive_path, output_folder, password, member_filter=None, depth=0):
         """Extração paralela para RAR."""
         try:
             with rarfile.RarFile(archive_path) as rf:
                 file_list = rf.infolist()
+                if member_filter:
+                    file_list = [f for f in file_list if member_filter(f.filename)]
+                if depth > 0:
+                    nested = [f for f in file_list if f.filename.lower().endswith(ARCHIVE_EXTENSIONS)]
+                    file_list = [f for f in file_list if f not in nested]
+                    for file in nested:
+                        with rf.open(file, pwd=password) as src:
+                            self.extract_stream(
+                                src, file.filename,
+                                os.path.dirname(self.rar_target(output_folder, file)),
+                                depth - 1
+                            )
                 def extract_file(file):
                     if not self._is_running:
                         return
-                    rf.extract(file, path=output_folder, pwd=password)
-                list(self.executor.map(extract_file, file_list))
+                    self.limiter.throttle(nfiles=1)
+                    self.progress.add(nfiles=1, name=file.filename)
+                    if not file.is_file():
+                        # Diretórios e links seguem as regras de segurança do próprio rarfile
+                        rf.extract(file, path=output_folder, pwd=password)
+                        return
+                    # Cópia em blocos: o limite de E/S vale durante a escrita do membro
+                    target_path = self.rar_target(output_folder, file)
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    with rf.open(file, pwd=password) as src, open(target_path, 'wb') as f:
+                        self.copy_stream(src, f)
+                    self.set_rar_attributes(file, target_path)
+                with ThreadPoolExecutor(max_workers=self.member_workers()) as pool:
+                    list(pool.map(extract_file, file_list))
         except rarfile.BadRarFile as e:
             if "password" in str(e).lower():
                 raise Exception("Arquivo RAR protegido por senha. Por favor, informe a senha correta.")
             raise
 
-    def extract_tar(self, archive_path, output_folder):
-        """Extração para TAR e derivados."""
-        ext = archive_path.lower()
-        if ext.endswith('.tar'):
-            mode = 'r'
-        elif ext.endswith('.tar.gz'):
-            mode = 'r:gz'
-        elif ext.endswith('.tar.bz2'):
-            mode = 'r:bz2'
-        elif ext.endswith('.tar.xz'):
-            mode = 'r:xz'
-        else:
-            mode = 'r'
-        with tarfile.open(archive_path, mode) as tf:
-            tf.extractall(path=output_folder)
-
-    def extract_simple(self, archive_path, output_folder, ext):
-        """Extração para GZ, BZ2, XZ, TGZ, TBZ2, TXZ."""
-        openers = {
-            '.gz': gzip.open,
-            '.tgz': gzip.open,
-            '.bz2': bz2.open,
-            '.tbz2': bz2.open,
-            '.xz': lzma.open,
-            '.txz': lzma.open
-        }
-        opener = openers.get(ext)
+    def rar_target(self, output_folder, file):
+        """Destino de um membro RAR com o nome saneado como no rarfile (sem sair da pasta)."""
+        name = rarfile.sanitize_filename(file.filename, os.sep, sys.platform == 'win32')
+        target_path = os.path.join(output_folder, name)
+        real_root = os.path.realpath(output_folder)
+        real_target = os.path.realpath(target_path)
+        if real_target != real_root and not real_target.startswith(real_root + os.sep):
+            raise rarfile.BadRarFile(f"Membro fora da pasta de destino: {file.filename}")
+        return target_path
+
+    def set_rar_attributes(self, file, target_path):
+        """Aplica permissões e data de modificação do membro, como o rf.extract faria."""
+        if file.host_os == rarfile.RAR_OS_UNIX:
+            os.chmod(target_path, file.mode & 0o777)
+        elif file.mode & 0x01:
+            # Atributo somente leitura do DOS/Windows
+            os.chmod(target_path, os.stat(target_path).st_mode & ~0o222)
+        if file.mtime:
+            mtime = file.mtime.timestamp()
+            os.utime(target_path, (mtime, mtime))
+
+    def extract_tar(self, archive_path, output_folder, member_filter=None, depth=0, volumes=None, sync=None):
+        """Extração para TAR e derivados."""
+        fmt = self.detect_format(archive_path)
+        compression = fmt[4:] if fmt.startswith('tar.') else ''
+        multi_volume = volumes is not None and len(volumes) > 1
+        if multi_volume or compression in ('zst', 'lz4'):
+            # Volumes concatenados e zstd/lz4 (sem suporte nativo no tarfile):
+            # descompressão em streaming alimentando o modo "r|"
+            raw = open_volumes(volumes) if multi_volume else open(archive_path, 'rb')
+            with CountingReader(raw, self.meter) as source:
+                stream = STREAM_OPENERS[compression](source, 'rb') if compression else source
+                with stream, tarfile.open(fileobj=stream, mode='r|') as tf:
+                    self.extract_tar_members(tf, output_folder, member_filter, depth, sync)
+            return
+        mode = 'r:' + fmt[4:] if fmt.startswith('tar.') else 'r'
+        with CountingReader(open(archive_path, 'rb'), self.meter) as source:
+            with tarfile.open(fileobj=source, mode=mode) as tf:
+                self.extract_tar_members(tf, output_folder, member_filter, depth, sync)
+
+    def extract_tar_members(self, tf, output_folder, member_filter=None, depth=0, sync=None):
+        """Extrai os membros de um TarFile já aberto (arquivo em disco ou fluxo aninhado).
+
+        Arquivos regulares são copiados em blocos (copy_stream), para que o limite
+        de E/S valha durante a escrita de membros grandes, e não só entre eles.
+        Com sync (extração incremental), cada cabeçalho é comparado ao manifesto
+        anterior durante a mesma passagem: membros inalterados são reaproveitados
+        e seus dados nem chegam a ser lidos.
+        """
+        for member in tf:
+            if member_filter and not member_filter(member.name):
+                continue
+            self.limiter.throttle(nfiles=1)
+            self.progress.add(nfiles=1, name=member.name)
+            nested = depth > 0 and member.name.lower().endswith(ARCHIVE_EXTENSIONS)
+            if sync is not None and member.isfile():
+                signature = [member.size, int(member.mtime)]
+                sync["members"][member.name] = signature
+                if not nested and sync["previous_folder"] and self.reuse_member(
+                    member.name, signature, sync["previous_folder"], sync["previous_members"], output_folder
+                ):
+                    sync["reused"] += 1
+                    continue
+            if member.isfile() and nested:
+                target_dir = os.path.join(output_folder, os.path.dirname(member.name))
+                os.makedirs(target_dir, exist_ok=True)
+                self.extract_stream(tf.extractfile(member), member.name, target_dir, depth - 1)
+            elif member.isfile():
+                self.write_tar_file(tf, member, output_folder)
+            else:
+                tf.extract(member, path=output_folder)
+
+    def write_tar_file(self, tf, member, output_folder):
+        """Grava um membro regular do TAR, preservando permissões e data de modificação."""
+        target_path = os.path.join(output_folder, os.path.normpath(member.name.lstrip('/')))
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        if os.path.lexists(target_path):
+            os.remove(target_path)
+        with tf.extractfile(member) as src, open(target_path, 'wb') as f:
+            self.copy_stream(src, f)
+        os.chmod(target_path, member.mode & 0o7777)
+        os.utime(target_path, (member.mtime, member.mtime))
+
+    def extract_stream(self, stream, name, output_folder, depth):
+        """Extrai um arquivo compactado aninhado direto do fluxo do membro externo.
+
+        TAR e compactação simples são processados em modo streaming; ZIP precisa
+        de acesso aleatório e é mantido em memória (até NESTED_SPOOL_LIMIT);
+        RAR e 7z dependem de ferramentas externas e passam por uma cópia em disco.
+        """
+        lower = name.lower()
+        base = os.path.basename(name)
+        target = os.path.join(output_folder, strip_archive_extension(base))
+        if lower.endswith(('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')):
+            os.makedirs(target, exist_ok=True)
+            with tarfile.open(fileobj=stream, mode='r|*') as tf:
+                self.extract_tar_members(tf, target, depth=depth)
+        elif lower.endswith(('.tar.zst', '.tzst', '.tar.lz4')):
+            os.makedirs(target, exist_ok=True)
+            opener = lz4_open if lower.endswith('.lz4') else zstd_open
+            with opener(stream, 'rb') as f_in:
+                with tarfile.open(fileobj=f_in, mode='r|') as tf:
+                    self.extract_tar_members(tf, target, depth=depth)
+        elif lower.endswith('.zip'):
+            with tempfile.SpooledTemporaryFile(max_size=NESTED_SPOOL_LIMIT, dir=output_folder) as spool:
+                shutil.copyfileobj(stream, spool)
+                spool.seek(0)
+                with zipfile.ZipFile(spool) as zf:
+                    self.extract_zip_members(zf, target, self.password, depth=depth)
+        elif lower.endswith(('.gz', '.bz2', '.xz', '.zst', '.lz4')):
+            opener = STREAM_OPENERS[os.path.splitext(lower)[1][1:]]
+            out_name = os.path.splitext(base)[0]
+            with opener(stream, 'rb') as f_in:
+                if depth > 0 and out_name.lower().endswith(ARCHIVE_EXTENSIONS):
+                    self.extract_stream(f_in, out_name, output_folder, depth - 1)
+                else:
+                    with open(os.path.join(output_folder, out_name), 'wb') as f_out:
+                        self.copy_stream(f_in, f_out)
+        else:
+            copy_path = os.path.join(output_folder, base)
+            with open(copy_path, 'wb') as f_out:
+                self.copy_stream(stream, f_out)
+            try:
+                if lower.endswith('.rar'):
+                    self.extract_rar(copy_path, target, self.password, depth=depth)
+                else:
+                    self.extract_7z(copy_path, target, self.password)
+                    self.extract_nested_on_disk(target, depth)
+            finally:
+                os.remove(copy_path)
+
+    def extract_nested_on_disk(self, output_folder, depth):
+        """Processa arquivos aninhados já gravados em disco (saída do 7-Zip)."""
+        if depth <= 0:
+            return
+        for root, _, files in os.walk(output_folder):
+            for f in files:
+                if f.lower().endswith(ARCHIVE_EXTENSIONS):
+                    path = os.path.join(root, f)
+                    with open(path, 'rb') as src:
+                        self.extract_stream(src, f, root, depth - 1)
+                    os.remove(path)
+
+    def list_archive_members(self, archive_path):
+        """Lista os membros (nome -> [tamanho, CRC/mtime]) lendo apenas os cabeçalhos.
+
+        Retorna None para formatos sem listagem barata (7z e compactação simples).
+        O TAR não tem diretório central: a comparação é feita durante a própria
+        extração (extract_tar_members), numa única passagem pelo fluxo.
+        """
+        fmt = self.detect_format(archive_path)
+        if fmt == 'zip':
+            with zipfile.ZipFile(archive_path) as zf:
+                return {
+                    i.filename: [i.file_size, i.CRC]
+                    for i in zf.infolist() if not i.is_dir()
+                }
+        if fmt == 'rar':
+            with rarfile.RarFile(archive_path) as rf:
+                return {
+                    i.filename: [i.file_size, i.CRC]
+                    for i in rf.infolist() if not i.is_dir()
+                }
+        return None
+
+    def find_previous_extraction(self, folder):
+        """Retorna (pasta, manifesto) da extração anterior mais recente que possui manifesto."""
+        candidates = []
+        for entry in os.scandir(folder):
+            if entry.is_dir() and entry.name.startswith("extracted_"):
+                manifest_path = os.path.join(entry.path, MANIFEST_NAME)
+                if os.path.isfile(manifest_path):
+                    candidates.append((os.path.getmtime(manifest_path), entry.path, manifest_path))
+        if not candidates:
+            return None, None
+        _, previous_folder, manifest_path = max(candidates)
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                return previous_folder, json.load(f).get("members", {})
+        except (OSError, ValueError):
+            return None, None
+
+    def carry_over_unchanged(self, members, previous_folder, previous_members, output_folder):
+        """Reaproveita (hardlink ou rename) os arquivos inalterados da extração anterior.
+
+        Retorna (membros que ainda precisam ser extraídos, quantidade reaproveitada).
+        Quando a extração anterior é a própria pasta de saída, os arquivos que
+        saíram do arquivo compactado são removidos dela.
+        """
+        self.remove_dropped_members(members, previous_folder, previous_members, output_folder)
+        pending = set()
+        reused = 0
+        for name, signature in members.items():
+            if self.reuse_member(name, signature, previous_folder, previous_members, output_folder):
+                reused += 1
+            else:
+                pending.add(name)
+        return pending, reused
+
+    def reuse_member(self, name, signature, previous_folder, previous_members, output_folder):
+        """Traz um membro inalterado da extração anterior; False quando ele precisa ser extraído."""
+        source = os.path.join(previous_folder, name)
+        if previous_members.get(name) != signature or not os.path.isfile(source):
+            return False
+        if os.path.normpath(previous_folder) != os.path.normpath(output_folder):
+            target = os.path.join(output_folder, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if os.path.lexists(target):
+                os.remove(target)
+            try:
+                os.link(source, target)
+            except OSError:
+                os.replace(source, target)
+        return True
+
+    def remove_dropped_members(self, members, previous_folder, previous_members, output_folder):
+        """Na reextração sobre a mesma pasta, apaga os arquivos que saíram do arquivo compactado."""
+        if os.path.normpath(previous_folder) != os.path.normpath(output_folder):
+            return
+        for name in previous_members.keys() - members.keys():
+            try:
+                os.remove(os.path.join(output_folder, name))
+            except FileNotFoundError:
+                pass
+
+    def write_manifest(self, output_folder, archive_name, members):
+        """Grava o manifesto da extração para uso na próxima execução incremental."""
+        with open(os.path.join(output_folder, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump({"archive": archive_name, "members": members}, f)
+
+    def index_path(self, archive_path):
+        """Caminho do índice em cache de um arquivo compactado."""
+        folder, name = os.path.split(archive_path)
+        return os.path.join(folder, "." + name + INDEX_SUFFIX)
+
+    def list_7z_members(self, archive_path, password=""):
+        """Lista os membros de um 7z via `7z l -slt` (sem extrair)."""
+        cmd = [find_seven_zip(), "l", "-slt", "-sccUTF-8", archive_path]
+        if password:
+            cmd.append(f"-p{password}")
+        output = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8').stdout
+        entries = []
+        current = {}
+        # Os blocos de cada membro vêm após a linha "----------"
+        for line in output.split("----------", 1)[-1].splitlines() + [""]:
+            if not line.strip():
+                if current.get("Path") and current.get("Attributes", "")[:1] != "D":
+                    entries.append({
+                        "name": current["Path"].replace("\\", "/"),
+                        "size": int(current.get("Size") or 0),
+                        "offset": None
+                    })
+                current = {}
+            elif " = " in line:
+                key, value = line.split(" = ", 1)
+                current[key] = value
+        return entries
+
+    def checkpoint_path(self, archive_path):
+        """Caminho dos checkpoints do descompressor gzip de um .tar.gz."""
+        folder, name = os.path.split(archive_path)
+        return os.path.join(folder, "." + name + CHECKPOINT_SUFFIX)
+
+    def open_decompressed(self, archive_path):
+        """Abre o fluxo descomprimido de um TAR, com seek eficiente quando possível.
+
+        Com indexed_gzip, .tar.gz usa os checkpoints gravados no índice; com python-xz,
+        .tar.xz de múltiplos blocos salta direto para o bloco. Sem eles o seek
+        avança descomprimindo (ainda assim sem ler além do último membro pedido).
+        """
+        fmt = self.detect_format(archive_path)
+        if fmt == 'tar.gz':
+            if indexed_gzip is None:
+                return gzip.open(archive_path, 'rb')
+            stream = indexed_gzip.IndexedGzipFile(archive_path, spacing=GZIP_CHECKPOINT_SPACING)
+            checkpoint_file = self.checkpoint_path(archive_path)
+            if (os.path.isfile(checkpoint_file)
+                    and os.path.getmtime(checkpoint_file) >= os.path.getmtime(archive_path)):
+                try:
+                    stream.import_index(checkpoint_file)
+                except Exception:
+                    pass
+            return stream
+        if fmt == 'tar.xz':
+            if xz_seekable is not None:
+                return xz_seekable.open(archive_path, 'rb')
+            return lzma.open(archive_path, 'rb')
+        if fmt == 'tar.bz2':
+            return bz2.open(archive_path, 'rb')
+        if fmt in ('tar.zst', 'tar.lz4'):
+            return STREAM_OPENERS[fmt[4:]](archive_path, 'rb')
+        return open(archive_path, 'rb')
+
+    def build_index(self, archive_path):
+        """Monta (ou reaproveita do cache) o índice de membros do arquivo.
+
+        Cada entrada traz nome, tamanho e deslocamento quando o formato permite
+        acesso aleatório (cabeçalho local no ZIP, dados no TAR).
+        """
+        stat = os.stat(archive_path)
+        cache_file = self.index_path(archive_path)
+        if os.path.isfile(cache_file):
+            try:
+                with open(cache_file, encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached.get("size") == stat.st_size and cached.get("mtime") == stat.st_mtime:
+                    return cached["members"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+        fmt = self.detect_format(archive_path)
+        if len(self.archive_volumes(archive_path)) > 1 and fmt not in ('rar', '7z'):
+            raise Exception("Índice não disponível para arquivos divididos neste formato.")
+        if fmt == 'zip':
+            with zipfile.ZipFile(archive_path) as zf:
+                entries = [
+                    {"name": i.filename, "size": i.file_size, "offset": i.header_offset}
+                    for i in zf.infolist() if not i.is_dir()
+                ]
+        elif fmt == 'rar':
+            with rarfile.RarFile(archive_path) as rf:
+                entries = [
+                    {"name": i.filename, "size": i.file_size, "offset": None}
+                    for i in rf.infolist() if not i.is_dir()
+                ]
+        elif fmt and fmt.startswith('tar'):
+            # O deslocamento é relativo ao fluxo descomprimido
+            with self.open_decompressed(archive_path) as stream:
+                with tarfile.open(fileobj=stream, mode='r:') as tf:
+                    entries = [
+                        {"name": m.name, "size": m.size, "offset": m.offset_data}
+                        for m in tf if m.isfile()
+                    ]
+                # A listagem percorreu o arquivo inteiro: os checkpoints já estão completos
+                if hasattr(stream, 'export_index'):
+                    try:
+                        stream.export_index(self.checkpoint_path(archive_path))
+                    except Exception:
+                        pass
+        elif fmt == '7z':
+            entries = self.list_7z_members(archive_path, self.password)
+        else:
+            out_name = os.path.splitext(os.path.basename(archive_path))[0]
+            entries = [{"name": out_name, "size": None, "offset": None}]
+
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "archive": os.path.basename(archive_path),
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                    "members": entries
+                }, f)
+        except OSError:
+            pass
+        return entries
+
+    def extract_members(self, archive_path, output_folder, names):
+        """Extrai sob demanda apenas os membros informados, com acesso aleatório quando possível."""
+        names = set(names)
+        index = {e["name"]: e for e in self.build_index(archive_path)}
+        missing = sorted(names - index.keys())
+        if missing:
+            raise Exception("Membro(s) não encontrado(s) no arquivo: " + ", ".join(missing))
+        os.makedirs(output_folder, exist_ok=True)
+        fmt = self.detect_format(archive_path)
+        if fmt == 'zip':
+            # O diretório central do ZIP já aponta para o deslocamento de cada membro
+            self.extract_zip(archive_path, output_folder, self.password, names.__contains__)
+        elif fmt == 'rar':
+            self.extract_rar(archive_path, output_folder, self.password, names.__contains__)
+        elif fmt == '7z':
+            self.extract_7z(archive_path, output_folder, self.password, include=sorted(names))
+        elif fmt and fmt.startswith('tar'):
+            # Leitura direta a partir do deslocamento indexado, em ordem crescente
+            # para que o seek nunca volte e a leitura pare no último membro pedido
+            wanted = sorted((index[n] for n in names), key=lambda e: e["offset"])
+            with self.open_decompressed(archive_path) as f_in:
+                for entry in wanted:
+                    target_path = os.path.join(output_folder, entry["name"])
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                    f_in.seek(entry["offset"])
+                    with open(target_path, 'wb') as f_out:
+                        remaining = entry["size"]
+                        while remaining > 0:
+                            chunk = f_in.read(min(remaining, COPY_CHUNK))
+                            if not chunk:
+                                break
+                            self.limiter.throttle(len(chunk))
+                            f_out.write(chunk)
+                            remaining -= len(chunk)
+        elif fmt in STREAM_OPENERS:
+            self.extract_simple(archive_path, output_folder, '.' + fmt)
+
+    def extract_simple(self, archive_path, output_folder, ext, member_filter=None, volumes=None):
+        """Extração para GZ, BZ2, XZ, ZST, LZ4 (e TGZ, TBZ2, TXZ, TZST pelos aliases)."""
+        key = ext.lstrip('.')
+        opener = STREAM_OPENERS.get(STREAM_ALIASES.get(key, key))
+        multi_volume = volumes is not None and len(volumes) > 1
+        base_name = os.path.basename(archive_path)
+        if multi_volume:
+            base_name = re.sub(r'\.\d{3}$', '', base_name)
+        out_name = os.path.splitext(base_name)[0]
+        if member_filter and not member_filter(out_name):
+            return
         if opener:
-            with opener(archive_path, 'rb') as f_in:
-                out_name = os.path.splitext(os.path.basename(archive_path))[0]
+            self.progress.add(nfiles=1, name=out_name)
+            raw = open_volumes(volumes) if multi_volume else open(archive_path, 'rb')
+            with CountingReader(raw, self.meter) as source, opener(source, 'rb') as f_in:
                 with open(os.path.join(output_folder, out_name), 'wb') as f_out:
-                    f_out.write(f_in.read())
+                    self.copy_stream(f_in, f_out)
 
     def extract_archive(self, archive_path, output_base):
         """Seleciona o método de extração apropriado."""
         try:
             archive_name = os.path.basename(archive_path)
-            output_folder = os.path.join(output_base, "extracted_" + os.path.splitext(archive_name)[0])
-            os.makedirs(output_folder, exist_ok=True)
-            original_size = os.path.getsize(archive_path) / (1024 * 1024)
-            ext = archive_path.lower()
-
-            # NOVO: pegar data de criação e modificação do arquivo
-            archive_ctime = os.path.getctime(archive_path)
-            archive_mtime = os.path.getmtime(archive_path)
-            archive_ctime_str = datetime.fromtimestamp(archive_ctime).strftime('%Y-%m-%d %H:%M:%S')
-            archive_mtime_str = datetime.fromtimestamp(archive_mtime).strftime('%Y-%m-%d %H:%M:%S')
-
-            if ext.endswith('.7z'):
-                self.update_status.emit("Extraindo com 7-Zip (máximo desempenho)...")
-                self.extract_7z(archive_path, output_folder, self.password)
-            elif ext.endswith('.zip'):
-                self.extract_zip(archive_path, output_folder, self.password)
-            elif ext.endswith('.rar'):
-                self.extract_rar(archive_path, output_folder, self.password)
-            elif ext.endswith(('.tar', '.tar.gz', '.tar.bz2', '.tar.xz')):
-                self.extract_tar(archive_path, output_folder)
-            elif ext.endswith(('.gz', '.tgz', '.bz2', '.tbz2', '.xz', '.txz')):
-                for e in ['.gz', '.tgz', '.bz2', '.tbz2', '.xz', '.txz']:
-                    if ext.endswith(e):
-                        self.extract_simple(archive_path, output_folder, e)
-                        break
-            else:
+            with self.tracer.span("open", archive=archive_name):
+                output_folder = os.path.join(output_base, "extracted_" + os.path.splitext(archive_name)[0])
+                os.makedirs(output_folder, exist_ok=True)
+                volumes = self.archive_volumes(archive_path)
+                original_size = sum(os.path.getsize(v) for v in volumes) / (1024 * 1024)
+                fmt = self.detect_format(archive_path)
+
+                # NOVO: pegar data de criação e modificação do arquivo
+                archive_ctime = os.path.getctime(archive_path)
+                archive_mtime = os.path.getmtime(archive_path)
+                archive_ctime_str = datetime.fromtimestamp(archive_ctime).strftime('%Y-%m-%d %H:%M:%S')
+                archive_mtime_str = datetime.fromtimestamp(archive_mtime).strftime('%Y-%m-%d %H:%M:%S')
+
+                # Filtros: o include da pasta substitui o da execução (a pasta sabe o que
+                # interessa nela); os excludes das duas se somam
+                folder_config = load_folder_config(output_base)
+                include = folder_config.get("include") or self.include_patterns
+                exclude = list(self.exclude_patterns) + list(folder_config.get("exclude", []))
+                depth = int(folder_config.get("nested_depth", self.nested_depth))
+                member_filter = None
+                if include or exclude:
+                    member_filter = lambda name: matches_patterns(name, include, exclude)
+
+            # Extração incremental: compara a listagem com o manifesto da extração anterior
+            members = None
+            reused = 0
+            sync = None
+            if self.incremental and fmt and fmt.startswith('tar'):
+                # TAR: a comparação acontece durante a própria extração (uma única passagem)
+                previous_folder, previous_members = self.find_previous_extraction(output_base)
+                sync = {
+                    "previous_folder": previous_folder,
+                    "previous_members": previous_members or {},
+                    "members": {},
+                    "reused": 0,
+                }
+            elif self.incremental and (len(volumes) == 1 or fmt == 'rar'):
+                with self.tracer.span("verify", archive=archive_name):
+                    members = self.list_archive_members(archive_path)
+                    if members is not None:
+                        if member_filter:
+                            members = {n: sig for n, sig in members.items() if member_filter(n)}
+                        previous_folder, previous_members = self.find_previous_extraction(output_base)
+                        if previous_folder:
+                            pending, reused = self.carry_over_unchanged(
+                                members, previous_folder, previous_members, output_folder
+                            )
+                            self.update_status.emit(
+                                f"Incremental: {reused} reaproveitado(s), {len(pending)} a extrair"
+                            )
+                            # Diretórios, links e demais membros não regulares não entram no
+                            # manifesto e continuam sujeitos só aos filtros de inclusão/exclusão
+                            pattern_filter = member_filter
+                            member_filter = lambda name: name in pending or (
+                                name not in members and (pattern_filter is None or pattern_filter(name))
+                            )
+
+            # Despacho pelo formato detectado nos bytes iniciais (não pela extensão)
+            handler = FORMAT_HANDLERS.get(fmt)
+            if handler is None:
                 raise Exception("Formato não suportado.")
+            with self.tracer.span("decompress", archive=archive_name, format=fmt):
+                handler(self, archive_path, output_folder, {
+                    "format": fmt,
+                    "member_filter": member_filter,
+                    "include": include,
+                    "exclude": exclude,
+                    "depth": depth,
+                    "volumes": volumes,
+                    "sync": sync
+                })
+
+            if sync is not None:
+                members = sync["members"]
+                reused = sync["reused"]
+                if sync["previous_folder"]:
+                    self.remove_dropped_members(
+                        members, sync["previous_folder"], sync["previous_members"], output_folder
+                    )
+                    self.update_status.emit(
+                        f"Incremental: {reused} reaproveitado(s), {len(members) - reused} extraído(s)"
+                    )
+
+            with self.tracer.span("post-stats", archive=archive_name):
+                if members is not None:
+                    self.write_manifest(output_folder, archive_name, members)
 
-            extracted_size = sum(
-                os.path.getsize(os.path.join(root, f))
-                for root, _, files in os.walk(output_folder)
-                for f in files
-            ) / (1024 * 1024)
+                extracted_bytes = 0
+                extracted_files = 0
+                for root, _, files in os.walk(output_folder):
+                    for f in files:
+                        if root == output_folder and f == MANIFEST_NAME:
+                            continue
+                        extracted_bytes += os.path.getsize(os.path.join(root, f))
+                        extracted_files += 1
+                extracted_size = extracted_bytes / (1024 * 1024)
 
             return {
                 "status": "Sucesso",
-                "message": f"Extraído via {'Otimizado' if ext.endswith(('.zip', '.rar', '.7z')) else 'Python'}",
+                "message": f"Extraído via {'Otimizado' if fmt in ('zip', 'rar', '7z') else 'Python'} ({fmt})",
+                "format": fmt,
+                "backend": format_backend(fmt, len(volumes)),
+                "volumes": len(volumes),
                 "original_size_mb": round(original_size, 2),
                 "extracted_size_mb": round(extracted_size, 2),
-                "files": os.listdir(output_folder),
+                "extracted_bytes": extracted_bytes,
+                "extracted_files": extracted_files,
+                # Só uma prévia fica em memória; a listagem completa é lida do disco no relatório
+                "files": list(itertools.islice(iter_extracted_names(output_folder), REPORT_PREVIEW_FILES)),
+                "files_total": sum(1 for _ in iter_extracted_names(output_folder)),
+                "output_folder": output_folder,
+                "reused_files": reused,
                 "latest_archive": archive_name,
                 "latest_archive_ctime": archive_ctime_str,
                 "latest_archive_mtime": archive_mtime_str
@@ -442,6 +2457,8 @@ class ExtractionThread(QThread):
             return {
                 "status": "Erro",
                 "message": str(e),
+                "error_class": error_class(e),
+                "format": fmt if 'fmt' in locals() else None,
                 "original_size_mb": round(original_size, 2) if 'original_size' in locals() else 0,
                 "extracted_size_mb": 0,
                 "files": [],
@@ -452,56 +2469,705 @@ class ExtractionThread(QThread):
 
     def run(self):
         self._is_running = True
-        if self.selected_folders is not None:
-            archive_folders = self.selected_folders
-        else:
-            archive_folders = self.find_archive_folders()
+        # Prioridade e afinidade valem para esta thread e para tudo o que ela criar
+        apply_priority(0, self.priority, self.cpu_affinity)
+        self.tracer.reset()
+        self.progress.reset()
+        self.tracer.begin_job()
+        with self.tracer.span("scan"):
+            if self.selected_folders is not None:
+                archive_folders = self.selected_folders
+            else:
+                archive_folders = self.find_archive_folders()
         total_results = {}
-        start_time = time.time()
 
         if not archive_folders:
+            self.run_stages = self.tracer.end_job()
             self.update_status.emit("Nenhum arquivo encontrado")
             self.extraction_done.emit({})
             return
 
-        total_files = len(archive_folders)
+        run_id = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+        history = self.open_history()
+        with self.tracer.span("plan", folders=len(archive_folders)):
+            jobs, skipped = self.plan_jobs(archive_folders, history)
+        self.run_stages = self.tracer.end_job()
+        stream = None
+        if self.results_file:
+            try:
+                stream = ResultStreamWriter(self.results_file, run_id)
+            except OSError as e:
+                self.update_status.emit(f"Falha ao abrir o fluxo de resultados: {e}")
+        for folder in skipped:
+            total_results[folder] = {"status": "Ignorado", "message": "Nenhum arquivo válido", "folder": folder}
+            if self.report_writer:
+                self.report_writer.add(folder, total_results[folder])
+            self.job_done.emit(folder, total_results[folder])
+            if stream:
+                stream.record(folder, total_results[folder])
+        # Com mais de um arquivo por pasta, os resultados passam a ser indexados pelo arquivo
+        multiple = self.archives_since is not None or self.archive_count > 1
+        self.controller = ConcurrencyController(self.meter, multiprocessing.cpu_count(), self.fixed_jobs)
+        job_formats = {}
+        for _, archive_path, size in jobs:
+            try:
+                fmt = self.detect_format(archive_path)
+            except OSError:
+                fmt = None
+            job_formats[archive_path] = (fmt or "desconhecido", size)
+        self.eta = EtaEstimator(job_formats, history.format_stats() if history else None)
+        meter_start = self.meter.total
 
-        for i, folder in enumerate(archive_folders):
-            if not self._is_running:
-                break
+        def run_job(job):
+            folder, latest_file, _ = job
             folder_start_time = time.time()
             self.update_status.emit(f"Processando: {os.path.basename(folder)}...")
+            self.tracer.begin_job()
+            with self.tracer.span("job", accumulate=False, folder=folder, archive=os.path.basename(latest_file)):
+                with self.profiled(folder, latest_file):
+                    result = self.extract_archive(latest_file, folder)
+            folder_time = time.time() - folder_start_time
+            result["processing_time"] = f"{folder_time:.1f}s"
+            result["processing_seconds"] = round(folder_time, 3)
+            result["stages"] = self.tracer.end_job()
+            result["folder"] = folder
+            self.record_metrics(job, result, folder_time)
+            # Falhas também saem da fila restante, mas não entram na calibração
+            self.eta.observe(latest_file, folder_time if result["status"] == "Sucesso" else None)
+            return result
+
+        # Fila única: novos jobs entram enquanto houver vaga no limite do controlador
+        pending = deque(jobs)
+        running = {}
+        while (pending or running) and self._is_running:
+            while pending and len(running) < self.controller.job_limit:
+                job = pending.popleft()
+                running[self.executor.submit(run_job, job)] = job
+            self.metrics.set("extrator_queue_depth", len(pending))
+            self.metrics.set("extrator_active_jobs", len(running))
+            done, _ = wait(list(running), timeout=CONTROLLER_INTERVAL, return_when=FIRST_COMPLETED)
+            if self.controller.sample():
+                self.update_status.emit(
+                    f"Vazão: {self.controller.rate/(1024*1024):.1f} MB/s — "
+                    f"{self.controller.job_limit} job(s) simultâneo(s)"
+                )
+                self.metrics.set("extrator_throughput_bytes_per_second", round(self.controller.rate))
+                self.metrics.set("extrator_concurrency_limit", self.controller.job_limit)
+                self.export_metrics()
+            for future in done:
+                folder, latest_file, size = running.pop(future)
+                key = latest_file if multiple else folder
+                total_results[key] = future.result()
+                if self.report_writer:
+                    self.report_writer.add(key, total_results[key])
+                self.job_done.emit(key, total_results[key])
+                if stream:
+                    stream.record(key, total_results[key])
+                if history:
+                    history.record(run_id, total_results[key], size)
+            # Jobs restantes que podem rodar em paralelo dividem o tempo estimado
+            self.update_eta(
+                self.meter.total - meter_start,
+                min(self.controller.job_limit, len(pending) + len(running))
+            )
+
+        if stream:
+            stream.close()
+        self.metrics.set("extrator_queue_depth", len(pending))
+        self.metrics.set("extrator_active_jobs", 0)
+        self.export_metrics()
+        self.progress.flush(force=True)
+        if self.trace_file:
+            try:
+                self.tracer.write_chrome_trace(self.trace_file)
+            except OSError as e:
+                self.update_status.emit(f"Falha ao gravar o trace: {e}")
+        # A retenção roda antes do aviso de conclusão: a interface só é liberada
+        # quando esta thread não tem mais exclusões em andamento
+        if self._is_running:
+            self.apply_retention(archive_folders, total_results, history)
+        if history:
+            history.close()
+        self.extraction_done.emit(total_results)
+
+    def apply_retention(self, archive_folders, results, history):
+        """Remove extrações antigas segundo a política, pelo caminho de exclusão em segundo plano.
 
-            latest_file = self.find_latest_archive(folder)
-            if not latest_file:
-                total_results[folder] = {"status": "Ignorado", "message": "Nenhum arquivo válido"}
+        Usa as pastas já descobertas nesta execução (uma listagem por pasta, sem
+        percorrer a árvore) e os tamanhos extraídos registrados no histórico.
+        """
+        if self.retention is None:
+            return
+        protected = {r.get("output_folder") for r in results.values()}
+        known_sizes = history.extracted_sizes() if history else {}
+        targets = []
+        candidates = []
+        for folder in archive_folders:
+            targets.extend(find_tombstones(folder))
+            try:
+                with os.scandir(folder) as it:
+                    entries = list(it)
+                # Data do backup de origem de cada extracted_*, pela mesma listagem
+                file_mtimes = {e.name: e.stat().st_mtime for e in entries if e.is_file()}
+                source_mtimes = {}
+                for volumes in group_volumes(folder, list(file_mtimes)):
+                    name = "extracted_" + os.path.splitext(os.path.basename(volumes[0]))[0]
+                    source_mtimes[name] = max(file_mtimes[os.path.basename(v)] for v in volumes)
+                for entry in entries:
+                    if not (entry.is_dir(follow_symlinks=False) and entry.name.startswith("extracted_")):
+                        continue
+                    candidates.append({
+                        "path": entry.path,
+                        "folder": folder,
+                        "mtime": source_mtimes.get(entry.name) or entry.stat().st_mtime,
+                        "size": known_sizes.get((folder, entry.name)),
+                    })
+            except OSError:
                 continue
+        doomed = self.retention.select(candidates, protected, time.time())
+        freed = 0
+        for candidate in doomed:
+            try:
+                targets.append(tombstone(candidate["path"]))
+                freed += candidate["size"] or 0
+            except OSError as e:
+                self.update_status.emit(f"Retenção: não foi possível remover {candidate['path']}: {e}")
+        if not targets:
+            return
+        self.update_status.emit(f"Retenção: removendo {len(doomed)} extração(ões) antiga(s)...")
+        # Mesma rotina da exclusão manual, executada nesta thread (já em segundo plano)
+        deleter = DeletionThread(targets)
+        deleter.run()
+        message = f"Retenção: {len(doomed)} extração(ões) removida(s)"
+        if freed:
+            message += f", {freed/(1024*1024):.1f} MB liberados"
+        if deleter.errors:
+            message += f" ({len(deleter.errors)} erro(s))"
+        self.update_status.emit(message)
+
+    def record_metrics(self, job, result, duration):
+        """Contabiliza nas métricas uma extração concluída."""
+        folder, _, size = job
+        fmt = result.get("format") or "desconhecido"
+        self.metrics.inc("extrator_jobs_total", status=result["status"])
+        self.metrics.observe("extrator_job_duration_seconds", duration, folder=folder)
+        if result["status"] == "Erro":
+            self.metrics.inc("extrator_failures_total", format=fmt)
+            return
+        self.metrics.inc("extrator_bytes_in_total", size)
+        self.metrics.inc("extrator_bytes_out_total", result.get("extracted_bytes", 0))
+        self.metrics.inc("extrator_files_extracted_total", result.get("extracted_files", 0))
+        self.metrics.inc("extrator_format_bytes_in_total", size, format=fmt)
+        self.metrics.inc("extrator_format_seconds_total", round(duration, 3), format=fmt)
+
+    def export_metrics(self):
+        """Atualiza o arquivo de métricas (textfile collector), se configurado."""
+        if self.metrics_file:
+            try:
+                self.metrics.write_textfile(self.metrics_file)
+            except OSError:
+                pass
+
+    def stop(self):
+        self._is_running = False
+        self.executor.shutdown(wait=False)
+
+@register_format('7z')
+def extract_7z_format(extractor, archive_path, output_folder, options):
+    extractor.update_status.emit("Extraindo com 7-Zip (máximo desempenho)...")
+    extractor.extract_7z(archive_path, output_folder, extractor.password, options["include"], options["exclude"])
+    extractor.meter.add(sum(os.path.getsize(v) for v in options["volumes"]))
+    extractor.extract_nested_on_disk(output_folder, options["depth"])
+
+
+@register_format('zip')
+def extract_zip_format(extractor, archive_path, output_folder, options):
+    if len(options["volumes"]) > 1:
+        # ZIP dividido (.z01 / .zip.001) não é suportado pelo zipfile
+        extract_7z_format(extractor, archive_path, output_folder, options)
+        return
+    extractor.extract_zip(archive_path, output_folder, extractor.password, options["member_filter"], options["depth"])
+
+
+@register_format('rar')
+def extract_rar_format(extractor, archive_path, output_folder, options):
+    extractor.extract_rar(archive_path, output_folder, extractor.password, options["member_filter"], options["depth"])
+    extractor.meter.add(sum(os.path.getsize(v) for v in options["volumes"]))
+
+
+@register_format('tar', 'tar.gz', 'tar.bz2', 'tar.xz', 'tar.zst', 'tar.lz4')
+def extract_tar_format(extractor, archive_path, output_folder, options):
+    extractor.extract_tar(
+        archive_path, output_folder, options["member_filter"], options["depth"], options["volumes"],
+        options.get("sync")
+    )
+
+
+@register_format('gz', 'bz2', 'xz', 'zst', 'lz4')
+def extract_simple_format(extractor, archive_path, output_folder, options):
+    extractor.extract_simple(
+        archive_path, output_folder, '.' + options["format"], options["member_filter"], options["volumes"]
+    )
+
+
+# Exclusão em segundo plano: a pasta é renomeada para uma "lápide" e apagada em paralelo
+TOMBSTONE_PREFIX = ".excluindo_"
+DELETE_WORKERS = min(32, multiprocessing.cpu_count() * 4)
+
+
+def tombstone(path):
+    """Renomeia a pasta para uma lápide na mesma pasta-mãe (instantâneo) e retorna o novo caminho."""
+    parent, name = os.path.split(path.rstrip(os.sep))
+    target = os.path.join(parent, f"{TOMBSTONE_PREFIX}{name}_{int(time.time() * 1000)}")
+    os.rename(path, target)
+    return target
+
+
+def find_tombstones(folder):
+    """Lápides de exclusões interrompidas (canceladas ou com o programa fechado)."""
+    try:
+        with os.scandir(folder) as it:
+            return [e.path for e in it if e.is_dir(follow_symlinks=False) and e.name.startswith(TOMBSTONE_PREFIX)]
+    except OSError:
+        return []
+
+
+def force_unlink(path):
+    try:
+        os.unlink(path)
+    except PermissionError:
+        # Arquivos somente leitura (comum no Windows)
+        os.chmod(path, stat.S_IWRITE)
+        os.unlink(path)
+
+
+class DeletionThread(QThread):
+    """Apaga lápides com workers paralelos de scandir/unlink, com progresso e cancelamento.
+
+    Cada diretório é listado por um worker, que remove os arquivos e enfileira
+    os subdiretórios; ao fim, os diretórios vazios são removidos do mais
+    profundo para o mais raso. Se cancelada, a lápide permanece e a exclusão
+    é retomada na próxima vez.
+    """
+    update_progress = pyqtSignal(dict)
+    deletion_done = pyqtSignal(dict)
+
+    def __init__(self, targets, parent=None):
+        super().__init__(parent)
+        self.targets = list(targets)
+        self.progress = ProgressAggregator(self.update_progress.emit)
+        self.errors = []
+        self._is_running = True
+
+    def clear_directory(self, path):
+        """Remove os arquivos do diretório e retorna os subdiretórios."""
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError as e:
+            self.errors.append(f"{path}: {e}")
+            return subdirs
+        for entry in entries:
+            if not self._is_running:
+                break
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    force_unlink(entry.path)
+                    self.progress.add(nfiles=1, name=entry.name)
+            except OSError as e:
+                self.errors.append(f"{entry.path}: {e}")
+        return subdirs
+
+    def remove_tree(self, root, pool):
+        directories = [(0, root)]
+        pending = {pool.submit(self.clear_directory, root): 0}
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future) + 1
+                for subdir in future.result():
+                    directories.append((depth, subdir))
+                    pending[pool.submit(self.clear_directory, subdir)] = depth
+        if not self._is_running:
+            return
+        for _, path in sorted(directories, reverse=True):
+            try:
+                os.rmdir(path)
+            except OSError as e:
+                self.errors.append(f"{path}: {e}")
 
-            elapsed = time.time() - start_time
-            avg_time_per_file = elapsed / (i + 1e-6)
-            remaining_files = total_files - (i + 1)
-            remaining_time = avg_time_per_file * remaining_files
+    def run(self):
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as pool:
+            for target in self.targets:
+                if not self._is_running:
+                    break
+                self.remove_tree(target, pool)
+        self.progress.flush(force=True)
+        self.deletion_done.emit({
+            "targets": len(self.targets),
+            "files": self.progress.files,
+            "errors": self.errors,
+            "cancelled": not self._is_running,
+        })
+
+    def stop(self):
+        self._is_running = False
+
+
+# Retenção das pastas extracted_*: unidades aceitas no orçamento de bytes
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+def parse_size(text):
+    """Converte "200GB", "512 MB" ou "1000" (bytes) em bytes."""
+    m = re.fullmatch(r'\s*([\d.]+)\s*([KMGT]?B?)\s*', text.upper())
+    if not m:
+        raise ValueError(f"Tamanho inválido: {text}")
+    return int(float(m.group(1)) * SIZE_UNITS[m.group(2)])
+
+
+def directory_size(path):
+    """Bytes ocupados por uma árvore (usado só quando o histórico não conhece a pasta)."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            continue
+    return total
+
+
+class RetentionPolicy:
+    """Quais extrações antigas remover: últimas N por pasta, idade máxima e orçamento de bytes.
+
+    As extrações são ordenadas pela data do backup de origem (mtime do
+    arquivo compactado; o do diretório só quando o arquivo já não existe),
+    pois a ordem de extração e as reextrações não refletem a idade do backup.
+    As extrações da execução atual nunca são removidas e ocupam vagas das N
+    mantidas. O orçamento vale para o conjunto de pastas da execução e, se
+    excedido, remove primeiro os backups mais antigos. O atime de diretórios
+    não serve como sinal de uso: a própria listagem do extrator o atualiza.
+    """
+
+    def __init__(self, keep_last=None, max_age_days=None, max_bytes=None):
+        self.keep_last = keep_last
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+
+    def select(self, candidates, protected, now, measure=directory_size):
+        """candidates: dicionários com path, folder, mtime (do backup) e size (None = desconhecido)."""
+        doomed = []
+        by_folder = {}
+        for candidate in candidates:
+            by_folder.setdefault(candidate["folder"], []).append(candidate)
+        for items in by_folder.values():
+            items.sort(key=lambda c: c["mtime"], reverse=True)
+            kept = sum(1 for c in items if c["path"] in protected)
+            for candidate in items:
+                if candidate["path"] in protected:
+                    continue
+                if self.keep_last is not None and kept >= self.keep_last:
+                    doomed.append(candidate)
+                elif self.max_age_days is not None and now - candidate["mtime"] > self.max_age_days * 86400:
+                    doomed.append(candidate)
+                else:
+                    kept += 1
+        if self.max_bytes is not None:
+            doomed_paths = {c["path"] for c in doomed}
+            remaining = [c for c in candidates if c["path"] not in doomed_paths]
+            for candidate in remaining:
+                if candidate["size"] is None:
+                    candidate["size"] = measure(candidate["path"])
+            total = sum(c["size"] for c in remaining)
+            for candidate in sorted(remaining, key=lambda c: c["mtime"]):
+                if total <= self.max_bytes:
+                    break
+                if candidate["path"] in protected:
+                    continue
+                doomed.append(candidate)
+                total -= candidate["size"]
+        return doomed
 
-            if remaining_time > 3600:
-                time_str = f"{remaining_time/3600:.1f} horas restantes"
-            elif remaining_time > 60:
-                time_str = f"{remaining_time/60:.1f} minutos restantes"
+
+def parse_retention(text):
+    """Converte "manter=3; dias=30; orcamento=200GB" em RetentionPolicy (None se vazio)."""
+    policy = RetentionPolicy()
+    for entry in text.split(';'):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key, _, value = entry.partition('=')
+        key = key.strip().lower()
+        try:
+            if key == "manter":
+                policy.keep_last = max(int(value), 1)
+            elif key == "dias":
+                policy.max_age_days = float(value)
+            elif key == "orcamento":
+                policy.max_bytes = parse_size(value)
             else:
-                time_str = f"{remaining_time:.0f} segundos restantes"
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Regra de retenção inválida: {entry} (use manter=N; dias=D; orcamento=200GB)")
+    if policy.keep_last is None and policy.max_age_days is None and policy.max_bytes is None:
+        return None
+    return policy
 
-            progress = int((i + 1) / total_files * 100)
-            self.update_progress.emit(progress, time_str)
 
-            result = self.extract_archive(latest_file, folder)
-            folder_time = time.time() - folder_start_time
-            result["processing_time"] = f"{folder_time:.1f}s"
-            total_results[folder] = result
+# Intervalo entre lotes de pastas entregues pela varredura em segundo plano
+SCAN_BATCH_INTERVAL = 0.2
 
-        self.extraction_done.emit(total_results)
+
+class FolderScanThread(QThread):
+    """Varre a pasta raiz em segundo plano e entrega (pasta, resumo) em lotes."""
+    folders_found = pyqtSignal(list)
+    # total encontrado, varredura cancelada
+    scan_done = pyqtSignal(int, bool)
+
+    def __init__(self, root_folder, parent=None):
+        super().__init__(parent)
+        self.root_folder = root_folder
+        self._is_running = True
+
+    def run(self):
+        batch = []
+        total = 0
+        last_emit = time.monotonic()
+        for item in scan_archive_folders(self.root_folder):
+            if not self._is_running:
+                break
+            batch.append(item)
+            total += 1
+            if time.monotonic() - last_emit >= SCAN_BATCH_INTERVAL:
+                self.folders_found.emit(batch)
+                batch = []
+                last_emit = time.monotonic()
+        if batch:
+            self.folders_found.emit(batch)
+        self.scan_done.emit(total, not self._is_running)
 
     def stop(self):
         self._is_running = False
-        self.executor.shutdown(wait=False)
+
+
+class FolderTableModel(QAbstractTableModel):
+    """Pastas da raiz (com o resumo da varredura) e marcação individual ou em bloco.
+
+    A marcação é guardada como um padrão mais as exceções, de modo que marcar
+    ou desmarcar todas as pastas não depende do tamanho da lista. Qt.UserRole
+    devolve o valor bruto de cada coluna, usado na ordenação.
+    """
+
+    HEADERS = ("Pasta", "Arquivo mais recente", "Tamanho", "Modificado em")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.folders = []
+        self.details = {}
+        self.default_checked = True
+        self.exceptions = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.folders)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        folder = self.folders[index.row()]
+        column = index.column()
+        if role == Qt.CheckStateRole and column == 0:
+            return Qt.Checked if self.is_checked(folder) else Qt.Unchecked
+        if role not in (Qt.DisplayRole, Qt.UserRole):
+            return None
+        info = self.details[folder]
+        raw = (folder, os.path.basename(info["latest_archive"]), info["size"], info["mtime"])[column]
+        if role == Qt.UserRole:
+            return raw
+        if column == 2:
+            return f"{raw / (1024 * 1024):.2f} MB"
+        if column == 3:
+            return datetime.fromtimestamp(raw).strftime('%Y-%m-%d %H:%M:%S')
+        return raw
+
+    def flags(self, index):
+        flags = super().flags(index)
+        return flags | Qt.ItemIsUserCheckable if index.column() == 0 else flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        self.set_checked(self.folders[index.row()], value == Qt.Checked)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def is_checked(self, folder):
+        return (folder in self.exceptions) != self.default_checked
+
+    def set_checked(self, folder, checked):
+        if checked == self.default_checked:
+            self.exceptions.discard(folder)
+        else:
+            self.exceptions.add(folder)
+
+    def clear(self):
+        self.beginResetModel()
+        self.folders = []
+        self.details = {}
+        self.default_checked = True
+        self.exceptions = set()
+        self.endResetModel()
+
+    def append_folders(self, items):
+        """Acrescenta uma lista de (pasta, resumo) vinda da varredura."""
+        if not items:
+            return
+        start = len(self.folders)
+        self.beginInsertRows(QModelIndex(), start, start + len(items) - 1)
+        for folder, info in items:
+            self.folders.append(folder)
+            self.details[folder] = info
+        self.endInsertRows()
+
+    def set_all_checked(self, checked, folders=None):
+        """Marca/desmarca todas as pastas (ou só as informadas, ex.: as visíveis no filtro)."""
+        if folders is None:
+            self.default_checked = checked
+            self.exceptions.clear()
+        else:
+            for folder in folders:
+                self.set_checked(folder, checked)
+        if self.folders:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.folders) - 1, 0), [Qt.CheckStateRole])
+
+    def checked_folders(self):
+        return [folder for folder in self.folders if self.is_checked(folder)]
+
+
+class ArchiveTaskThread(QThread):
+    """Executa uma operação demorada sobre um arquivo (indexar, extrair membros) fora da interface."""
+    task_done = pyqtSignal(object)
+    task_failed = pyqtSignal(str)
+
+    def __init__(self, function, *args, parent=None):
+        super().__init__(parent)
+        self.function = function
+        self.args = args
+
+    def run(self):
+        try:
+            result = self.function(*self.args)
+        except Exception as e:
+            self.task_failed.emit(str(e))
+            return
+        self.task_done.emit(result)
+
+
+class ArchiveBrowserDialog(QDialog):
+    """Navega pelo índice do arquivo mais recente e extrai membros sob demanda."""
+
+    MAX_VISIBLE = 5000
+
+    def __init__(self, archive_path, entries, output_folder, password="", parent=None):
+        super().__init__(parent)
+        self.archive_path = archive_path
+        self.entries = entries
+        self.output_folder = output_folder
+        self.password = password
+        self.setWindowTitle(f"Conteúdo de {os.path.basename(archive_path)}")
+        self.resize(800, 600)
+
+        layout = QVBoxLayout()
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filtrar (ex.: *.sql)")
+        self.filter_input.textChanged.connect(self.refresh)
+        layout.addWidget(self.filter_input)
+
+        self.member_list = QListWidget()
+        self.member_list.setSelectionMode(QListWidget.ExtendedSelection)
+        layout.addWidget(self.member_list, stretch=1)
+
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+
+        self.extract_btn = QPushButton("Extrair Selecionados")
+        self.extract_btn.clicked.connect(self.extract_selected)
+        layout.addWidget(self.extract_btn)
+        self.extract_thread = None
+
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        patterns = parse_patterns(self.filter_input.text())
+        self.member_list.clear()
+        shown = 0
+        for entry in self.entries:
+            if patterns and not matches_patterns(entry["name"], patterns, []):
+                continue
+            if shown >= self.MAX_VISIBLE:
+                break
+            size = entry.get("size")
+            label = f"{entry['name']}  ({size/(1024*1024):.2f} MB)" if size is not None else entry["name"]
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, entry["name"])
+            self.member_list.addItem(item)
+            shown += 1
+        self.info_label.setText(
+            f"{shown} de {len(self.entries)} membro(s) exibido(s)"
+            + (" — refine o filtro para ver mais" if shown >= self.MAX_VISIBLE else "")
+        )
+
+    def extract_selected(self):
+        names = [item.data(Qt.UserRole) for item in self.member_list.selectedItems()]
+        if not names:
+            QMessageBox.information(self, "Atenção", "Selecione ao menos um arquivo.")
+            return
+        extractor = ExtractionThread()
+        extractor.password = self.password
+        self.extract_btn.setEnabled(False)
+        self.info_label.setText(f"Extraindo {len(names)} arquivo(s)...")
+        self.extract_thread = ArchiveTaskThread(
+            extractor.extract_members, self.archive_path, self.output_folder, names, parent=self
+        )
+        self.extract_thread.task_done.connect(lambda _: self.extraction_finished(len(names)))
+        self.extract_thread.task_failed.connect(self.extraction_failed)
+        self.extract_thread.start()
+
+    def extraction_finished(self, count):
+        self.extract_btn.setEnabled(True)
+        self.refresh()
+        QMessageBox.information(
+            self, "Concluído", f"{count} arquivo(s) extraído(s) em {self.output_folder}"
+        )
+
+    def extraction_failed(self, message):
+        self.extract_btn.setEnabled(True)
+        self.refresh()
+        QMessageBox.warning(self, "Erro", f"Erro ao extrair: {message}")
+
+    def done(self, result):
+        # A thread é filha do diálogo: fechar durante a extração espera o término
+        if self.extract_thread is not None:
+            self.extract_thread.wait()
+        super().done(result)
+
 
 class BackupExtractor(QMainWindow):
     def __init__(self):
@@ -555,19 +3221,47 @@ class BackupExtractor(QMainWindow):
         self.select_btn.setObjectName("folderButton")
         self.select_btn.clicked.connect(self.select_root_folder)
         folder_group_layout.addWidget(self.select_btn, stretch=1)
+
+        self.cancel_scan_btn = QPushButton("Cancelar Busca")
+        self.cancel_scan_btn.clicked.connect(self.cancel_scan)
+        folder_group_layout.addWidget(self.cancel_scan_btn, stretch=1)
+        self.cancel_scan_btn.hide()
         
         folder_group.setLayout(folder_group_layout)
         select_layout.addWidget(folder_group)
 
-        # Lista de pastas
-        self.folder_list = QListWidget()
-        self.folder_list.setSelectionMode(QListWidget.MultiSelection)
+        # Lista de pastas (modelo/visão: só as linhas visíveis são desenhadas)
+        self.scan_thread = None
+        self.index_thread = None
+        self.thread = None
+        self.folder_model = FolderTableModel(self)
+        self.folder_proxy = QSortFilterProxyModel(self)
+        self.folder_proxy.setSourceModel(self.folder_model)
+        self.folder_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.folder_proxy.setFilterKeyColumn(0)
+        self.folder_proxy.setSortRole(Qt.UserRole)
+
+        self.folder_filter_input = QLineEdit()
+        self.folder_filter_input.setPlaceholderText("🔍 Filtrar pastas...")
+        self.folder_filter_input.textChanged.connect(self.folder_proxy.setFilterFixedString)
+        select_layout.addWidget(self.folder_filter_input)
+        self.folder_filter_input.hide()
+
+        self.folder_list = QTableView()
+        self.folder_list.setModel(self.folder_proxy)
+        self.folder_list.setSelectionBehavior(QTableView.SelectRows)
+        self.folder_list.setSelectionMode(QTableView.MultiSelection)
+        self.folder_list.setSortingEnabled(True)
+        self.folder_list.sortByColumn(-1, Qt.AscendingOrder)
+        self.folder_list.verticalHeader().hide()
+        self.folder_list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.folder_list.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.folder_list.setMinimumHeight(200)
         select_layout.addWidget(self.folder_list)
         self.folder_list.hide()
 
         # NOVO: duplo clique para abrir pasta extraída
-        self.folder_list.itemDoubleClicked.connect(self.open_extracted_folder)
+        self.folder_list.doubleClicked.connect(self.open_extracted_folder)
 
         # NOVO: botões de seleção e exclusão
         btn_select_all = QPushButton("Marcar Todos")
@@ -576,11 +3270,16 @@ class BackupExtractor(QMainWindow):
         btn_select_all.clicked.connect(self.select_all_folders)
         btn_unselect_all.clicked.connect(self.unselect_all_folders)
         btn_delete.clicked.connect(self.delete_extracted_folders)
+        self.delete_thread = None
+        self.cancel_delete_btn = QPushButton("Cancelar Exclusão")
+        self.cancel_delete_btn.clicked.connect(self.cancel_deletion)
+        self.cancel_delete_btn.hide()
 
         btns = QHBoxLayout()
         btns.addWidget(btn_select_all)
         btns.addWidget(btn_unselect_all)
         btns.addWidget(btn_delete)
+        btns.addWidget(self.cancel_delete_btn)
         select_layout.addLayout(btns)
 
         # Grupo senha
@@ -601,6 +3300,72 @@ class BackupExtractor(QMainWindow):
         password_group.setLayout(password_layout)
         select_layout.addWidget(password_group)
 
+        # Filtros de seleção de arquivos
+        filter_group = QWidget()
+        filter_layout = QHBoxLayout()
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout.setSpacing(10)
+
+        self.include_input = QLineEdit()
+        self.include_input.setPlaceholderText("Incluir (ex.: *.sql; *.bak)")
+        filter_layout.addWidget(self.include_input)
+
+        self.exclude_input = QLineEdit()
+        self.exclude_input.setPlaceholderText("Excluir (ex.: *.tmp; logs/*)")
+        filter_layout.addWidget(self.exclude_input)
+
+        filter_group.setLayout(filter_layout)
+        select_layout.addWidget(filter_group)
+
+        # Opções de extração
+        self.incremental_check = QCheckBox("♻️ Extração incremental (reaproveita arquivos inalterados da extração anterior)")
+        select_layout.addWidget(self.incremental_check)
+
+        nested_layout = QHBoxLayout()
+        nested_label = QLabel("🪆 Níveis de arquivos aninhados a extrair (0 = desativado):")
+        nested_layout.addWidget(nested_label)
+        self.nested_spin = QSpinBox()
+        self.nested_spin.setRange(0, 10)
+        nested_layout.addWidget(self.nested_spin)
+        nested_layout.addStretch()
+        select_layout.addLayout(nested_layout)
+
+        selection_layout = QHBoxLayout()
+        selection_layout.addWidget(QLabel("🗂️ Arquivos mais recentes por pasta:"))
+        self.count_spin = QSpinBox()
+        self.count_spin.setRange(1, 1000)
+        selection_layout.addWidget(self.count_spin)
+        self.since_input = QLineEdit()
+        self.since_input.setPlaceholderText("ou todos desde (AAAA-MM-DD [HH:MM])")
+        selection_layout.addWidget(self.since_input)
+        select_layout.addLayout(selection_layout)
+
+        self.throttle_input = QLineEdit()
+        self.throttle_input.setPlaceholderText("🚦 Limite de E/S por horário (ex.: 08:00-18:00=50/500 → 50 MB/s e 500 arquivos/s)")
+        select_layout.addWidget(self.throttle_input)
+
+        self.retention_input = QLineEdit()
+        self.retention_input.setPlaceholderText("🧹 Retenção de extrações (ex.: manter=3; dias=30; orcamento=200GB)")
+        select_layout.addWidget(self.retention_input)
+
+        priority_layout = QHBoxLayout()
+        priority_layout.addWidget(QLabel("⚙️ Prioridade:"))
+        self.priority_combo = QComboBox()
+        self.priority_combo.addItems(list(PRIORITY_PROFILES))
+        self.priority_combo.setCurrentText(DEFAULT_PRIORITY)
+        priority_layout.addWidget(self.priority_combo)
+        self.cpus_input = QLineEdit()
+        self.cpus_input.setPlaceholderText("CPUs dedicadas (ex.: 0-3,6; vazio = todas)")
+        if not CPU_AFFINITY_AVAILABLE:
+            self.cpus_input.setPlaceholderText("CPUs dedicadas: requer psutil nesta plataforma")
+            self.cpus_input.setEnabled(False)
+        priority_layout.addWidget(self.cpus_input)
+        priority_layout.addWidget(QLabel("🔬 Perfilamento:"))
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItems(list(PROFILE_MODES))
+        priority_layout.addWidget(self.profile_combo)
+        select_layout.addLayout(priority_layout)
+
         # Botão de extrair centralizado
         btn_container = QWidget()
         btn_layout = QHBoxLayout()
@@ -653,6 +3418,14 @@ class BackupExtractor(QMainWindow):
         self.report_text.setReadOnly(True)
         report_layout.addWidget(self.report_text, stretch=1)
 
+        # Arquivos extraídos: carregados do disco em páginas ao expandir cada pasta
+        self.report_tree = QTreeWidget()
+        self.report_tree.setHeaderLabel("📄 Arquivos extraídos (expanda para listar)")
+        self.report_tree.itemExpanded.connect(self.load_report_files)
+        self.report_tree.itemDoubleClicked.connect(self.load_more_report_files)
+        report_layout.addWidget(self.report_tree, stretch=1)
+        self.report_writer = None
+
         self.tabs.addTab(report_tab, "📊 Relatório")
 
         self.status_bar = self.statusBar()
@@ -668,51 +3441,99 @@ class BackupExtractor(QMainWindow):
             self.folder_label.setText(f"📂 Pasta principal: {folder}")
             self.extract_btn.setEnabled(True)
             self.status_bar.showMessage(f"Pasta selecionada: {os.path.basename(folder)}")
-            # Listar subpastas com arquivos compactados
-            self.folder_list.clear()
+            # Listar subpastas com arquivos compactados: a lista é preenchida durante a varredura
+            if self.scan_thread is not None:
+                self.scan_thread.stop()
+            self.folder_model.clear()
+            self.folder_filter_input.show()
             self.folder_list.show()
-            # Correção: use uma instância temporária para buscar as pastas
-            temp_thread = ExtractionThread()
-            temp_thread.root_folder = folder
-            archive_folders = temp_thread.find_archive_folders()
-            for subfolder in archive_folders:
-                item = QListWidgetItem(subfolder)
-                item.setCheckState(Qt.Checked)
-                self.folder_list.addItem(item)
+            self.extract_btn.setEnabled(False)
+            self.cancel_scan_btn.show()
+            self.scan_thread = FolderScanThread(folder, self)
+            self.scan_thread.folders_found.connect(self.add_scanned_folders)
+            self.scan_thread.scan_done.connect(self.scan_finished)
+            self.scan_thread.start()
+
+    def cancel_scan(self):
+        if self.scan_thread is not None:
+            self.scan_thread.stop()
+
+    def add_scanned_folders(self, folders):
+        # Lotes de uma varredura anterior (raiz trocada) são descartados
+        if self.sender() is not self.scan_thread:
+            return
+        self.folder_model.append_folders(folders)
+        self.status_bar.showMessage(f"Procurando pastas... {self.folder_model.rowCount()} encontrada(s)")
+
+    def scan_finished(self, total, cancelled):
+        if self.sender() is not self.scan_thread:
+            return
+        self.cancel_scan_btn.hide()
+        self.extract_btn.setEnabled(total > 0)
+        if cancelled:
+            self.status_bar.showMessage(f"Busca cancelada: {total} pasta(s) encontrada(s) até o momento")
+        else:
+            self.status_bar.showMessage(f"{total} pasta(s) com arquivos compactados")
 
     def start_extraction(self):
-        selected_folders = [
-            self.folder_list.item(i).text()
-            for i in range(self.folder_list.count())
-            if self.folder_list.item(i).checkState() == Qt.Checked
-        ]
+        selected_folders = self.folder_model.checked_folders()
         if not selected_folders:
             QMessageBox.warning(self, "Aviso", "Selecione ao menos uma pasta para extrair.")
             return
+        try:
+            archives_since = parse_since(self.since_input.text())
+            schedule = parse_schedule(self.throttle_input.text())
+            retention = parse_retention(self.retention_input.text())
+            cpu_affinity = parse_cpu_list(self.cpus_input.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Aviso", str(e))
+            return
 
+        # O aviso de conclusão chega pouco antes de run() retornar
+        if self.thread is not None:
+            self.thread.wait()
         self.thread = ExtractionThread()
         self.thread.root_folder = self.root_folder
         self.thread.password = self.password_input.text()
         self.thread.selected_folders = selected_folders
+        self.thread.incremental = self.incremental_check.isChecked()
+        self.thread.nested_depth = self.nested_spin.value()
+        self.thread.archive_count = self.count_spin.value()
+        self.thread.archives_since = archives_since
+        self.thread.limiter = RateLimiter(schedule)
+        self.thread.retention = retention
+        self.thread.priority = self.priority_combo.currentText()
+        self.thread.cpu_affinity = cpu_affinity
+        self.thread.include_patterns = parse_patterns(self.include_input.text())
+        self.thread.exclude_patterns = parse_patterns(self.exclude_input.text())
+        self.thread.trace_file = os.path.join(self.root_folder, "trace_extracao.json")
+        self.thread.profile_mode = self.profile_combo.currentText()
+        self.thread.results_file = os.path.join(self.root_folder, RESULTS_NAME)
 
         self.thread.update_progress.connect(self.update_progress)
         self.thread.update_status.connect(self.update_status)
+        self.thread.job_done.connect(self.add_report_entry)
         self.thread.extraction_done.connect(self.extraction_complete)
 
         self.set_ui_enabled(False)
         self.report_text.clear()
+        self.report_tree.clear()
+        self.start_report()
         self.progress_bar.setValue(0)
         self.thread.start()
 
-    def update_progress(self, value, time_remaining):
-        self.progress_bar.setValue(value)
-        self.time_label.setText(f"⏳ {time_remaining}")
-        QApplication.processEvents()
+    def update_progress(self, snapshot):
+        # Recebe apenas instantâneos consolidados (até 10/s); o laço de eventos cuida do redesenho
+        self.progress_bar.setValue(snapshot["percent"])
+        if snapshot["eta"]:
+            self.time_label.setText(f"⏳ {snapshot['eta']}")
+        self.status_bar.showMessage(
+            f"{snapshot['files']} arquivo(s), {snapshot['bytes']/(1024*1024):.1f} MB "
+            f"({snapshot['rate']/(1024*1024):.1f} MB/s) — {snapshot['current']}"
+        )
 
     def update_status(self, message):
         self.status_bar.showMessage(message)
-        self.time_label.setText(message)
-        QApplication.processEvents()
 
     def extraction_complete(self, results):
         self.set_ui_enabled(True)
@@ -726,62 +3547,86 @@ class BackupExtractor(QMainWindow):
     def set_ui_enabled(self, enabled):
         self.select_btn.setEnabled(enabled)
         self.password_input.setEnabled(enabled)
+        self.incremental_check.setEnabled(enabled)
+        self.nested_spin.setEnabled(enabled)
+        self.count_spin.setEnabled(enabled)
+        self.since_input.setEnabled(enabled)
+        self.throttle_input.setEnabled(enabled)
+        self.retention_input.setEnabled(enabled)
+        self.priority_combo.setEnabled(enabled)
+        self.cpus_input.setEnabled(enabled and CPU_AFFINITY_AVAILABLE)
+        self.profile_combo.setEnabled(enabled)
+        self.include_input.setEnabled(enabled)
+        self.exclude_input.setEnabled(enabled)
         self.extract_btn.setEnabled(enabled)
 
-    def generate_report(self, results):
-        report_lines = [
+    def start_report(self):
+        """Abre o relatório em disco e grava o cabeçalho; as pastas entram ao terminar."""
+        header = [
             f"📝 RELATÓRIO DE EXTRAÇÃO - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             f"📂 Pasta principal: {self.root_folder}",
             f"🔑 Senha usada: {'Sim' if self.password_input.text() else 'Não'}",
+            f"🔎 Filtros: incluir [{self.include_input.text() or '*'}] / excluir [{self.exclude_input.text() or '-'}]",
+            f"🧵 Trace (chrome://tracing): {self.thread.trace_file}",
+            f"📑 Resultados estruturados: {self.thread.results_file}.jsonl / .csv",
+            f"🔬 Perfilamento: {self.thread.profile_mode}"
+            + (f" ({os.path.join(self.root_folder, PROFILE_DIR_NAME)})" if self.thread.profile_mode != "desligado" else ""),
             "\n" + "="*80
         ]
+        self.report_writer = ReportWriter(os.path.join(self.root_folder, REPORT_NAME), header)
+        self.thread.report_writer = self.report_writer
+        self.report_text.setPlainText("\n".join(header))
 
-        total_original_size = 0
-        total_extracted_size = 0
-
-        for folder, data in results.items():
-            folder_name = os.path.basename(folder)
-            status_icon = "✅" if data['status'] == 'Sucesso' else "❌"
-
-            latest_file = data.get('latest_archive', 'N/A')
-            latest_file_ctime = data.get('latest_archive_ctime', 'N/A')
-            latest_file_mtime = data.get('latest_archive_mtime', 'N/A')
-
-            report_lines.extend([
-                f"\n📁 {folder_name}",
-                f"   {status_icon} Status: {data['status']}",
-                f"   📦 Arquivo mais recente: {latest_file}",
-                f"   🕒 Criado em: {latest_file_ctime}",
-                f"   🕒 Modificado em: {latest_file_mtime}",
-                f"   📦 Tamanho original: {data.get('original_size_mb', 0):.2f} MB",
-                f"   🗃️ Tamanho extraído: {data.get('extracted_size_mb', 0):.2f} MB",
-                f"   💬 Mensagem: {data['message']}",
-                f"   ⏱️ Tempo de processamento: {data.get('processing_time', 'N/A')}"
+    def add_report_entry(self, key, data):
+        # A seção completa já foi gravada em disco pela thread de extração; a tela recebe só a prévia
+        self.report_text.append("\n".join(report_section(key, data, REPORT_PREVIEW_FILES)))
+        if data.get('output_folder') and data.get('files'):
+            item = QTreeWidgetItem([
+                f"📁 {os.path.basename(data.get('folder', key))} ({data.get('files_total', 0)} item(ns))"
             ])
+            item.setData(0, Qt.UserRole, data['output_folder'])
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            self.report_tree.addTopLevelItem(item)
+
+    def load_report_files(self, item, offset=0):
+        """Lista a próxima página da pasta do item (somente na primeira expansão)."""
+        path = item.data(0, Qt.UserRole)
+        if not path or (offset == 0 and item.childCount()):
+            return
+        # A ordem do scandir é estável para a mesma pasta; só a página pedida é mantida
+        with os.scandir(path) as it:
+            names = (e for e in it if e.name != MANIFEST_NAME)
+            page = list(itertools.islice(names, offset, offset + REPORT_PAGE_SIZE + 1))
+        for entry in page[:REPORT_PAGE_SIZE]:
+            child = QTreeWidgetItem([entry.name])
+            if entry.is_dir():
+                child.setData(0, Qt.UserRole, entry.path)
+                child.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            item.addChild(child)
+        if len(page) > REPORT_PAGE_SIZE:
+            more = QTreeWidgetItem(["⬇️ Carregar mais... (duplo clique)"])
+            more.setData(0, Qt.UserRole + 1, offset + REPORT_PAGE_SIZE)
+            item.addChild(more)
 
-            if data.get('files'):
-                report_lines.append("   📄 Arquivos extraídos:")
-                report_lines.extend(f"      - {file}" for file in data['files'])
+    def load_more_report_files(self, item, column):
+        offset = item.data(0, Qt.UserRole + 1)
+        if offset is None:
+            return
+        parent = item.parent()
+        parent.removeChild(item)
+        self.load_report_files(parent, offset)
 
-            total_original_size += data.get('original_size_mb', 0)
-            total_extracted_size += data.get('extracted_size_mb', 0)
+    def generate_report(self, results):
+        """Fecha o relatório com o resumo da execução."""
+        footer = self.report_writer.summary()
+        footer.insert(1, f"🧭 Etapas da execução: {format_stages(self.thread.run_stages) or 'N/A'}")
+        self.report_writer.close(footer)
+        self.report_text.append("\n".join(footer))
+        self.status_bar.showMessage(f"Relatório salvo em: {self.report_writer.path}", 5000)
 
-        report_lines.extend([
-            "\n" + "="*80,
-            f"ℹ️ Total de pastas processadas: {len(results)}",
-            f"📊 Tamanho total original: {total_original_size:.2f} MB",
-            f"📦 Tamanho total extraído: {total_extracted_size:.2f} MB"
-        ])
-        self.report_text.setPlainText("\n".join(report_lines))
-
-        report_file = os.path.join(self.root_folder, "relatorio_extracao.txt")
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("\n".join(report_lines))
-        self.status_bar.showMessage(f"Relatório salvo em: {report_file}", 5000)
-
-    def open_extracted_folder(self, item):
+    def open_extracted_folder(self, index):
         # Abre a pasta extraída correspondente no Explorer
-        folder = item.text()
+        folder = index.sibling(index.row(), 0).data()
         latest_file = ExtractionThread().find_latest_archive(folder)
         if latest_file:
             archive_name = os.path.splitext(os.path.basename(latest_file))[0]
@@ -789,24 +3634,54 @@ class BackupExtractor(QMainWindow):
             if os.path.exists(extracted_folder):
                 os.startfile(extracted_folder)
             else:
-                QMessageBox.warning(self, "Aviso", "Pasta extraída não encontrada.")
+                confirm = QMessageBox.question(
+                    self, "Pasta extraída não encontrada",
+                    "A pasta ainda não foi extraída. Deseja navegar pelo conteúdo do arquivo e extrair apenas o necessário?",
+                    QMessageBox.Yes | QMessageBox.No
+                )
+                if confirm == QMessageBox.Yes:
+                    self.start_indexing(latest_file, extracted_folder)
         else:
             QMessageBox.warning(self, "Aviso", "Nenhum arquivo compactado encontrado.")
 
+    def start_indexing(self, archive_path, extracted_folder):
+        """Indexa o arquivo em segundo plano e abre o navegador de membros ao terminar."""
+        if self.index_thread is not None and self.index_thread.isRunning():
+            QMessageBox.information(self, "Atenção", "Aguarde o término da indexação em andamento.")
+            return
+        extractor = ExtractionThread()
+        extractor.password = self.password_input.text()
+        self.status_bar.showMessage(f"Indexando {os.path.basename(archive_path)}...")
+        self.index_thread = ArchiveTaskThread(extractor.build_index, archive_path, parent=self)
+        self.index_thread.task_done.connect(
+            lambda entries: self.show_archive_browser(archive_path, entries, extracted_folder, extractor.password)
+        )
+        self.index_thread.task_failed.connect(
+            lambda message: QMessageBox.warning(self, "Erro", f"Erro ao indexar {archive_path}: {message}")
+        )
+        self.index_thread.start()
+
+    def show_archive_browser(self, archive_path, entries, extracted_folder, password):
+        self.status_bar.showMessage(f"{len(entries)} membro(s) em {os.path.basename(archive_path)}")
+        ArchiveBrowserDialog(archive_path, entries, extracted_folder, password, self).exec_()
+
+    def visible_folders(self):
+        """Pastas visíveis no filtro atual (None quando não há filtro)."""
+        if not self.folder_filter_input.text():
+            return None
+        return [
+            self.folder_proxy.index(row, 0).data()
+            for row in range(self.folder_proxy.rowCount())
+        ]
+
     def select_all_folders(self):
-        for i in range(self.folder_list.count()):
-            self.folder_list.item(i).setCheckState(Qt.Checked)
+        self.folder_model.set_all_checked(True, self.visible_folders())
 
     def unselect_all_folders(self):
-        for i in range(self.folder_list.count()):
-            self.folder_list.item(i).setCheckState(Qt.Unchecked)
+        self.folder_model.set_all_checked(False, self.visible_folders())
 
     def delete_extracted_folders(self):
-        selected = [
-            self.folder_list.item(i).text()
-            for i in range(self.folder_list.count())
-            if self.folder_list.item(i).isSelected()
-        ]
+        selected = [index.data() for index in self.folder_list.selectionModel().selectedRows(0)]
         if not selected:
             QMessageBox.information(self, "Atenção", "Selecione pelo menos uma pasta na lista para excluir a extração.")
             return
@@ -815,18 +3690,457 @@ class BackupExtractor(QMainWindow):
             f"Tem certeza que deseja excluir as extrações selecionadas?",
             QMessageBox.Yes | QMessageBox.No
         )
-        if confirm == QMessageBox.Yes:
-            for folder in selected:
-                latest_file = ExtractionThread().find_latest_archive(folder)
-                if latest_file:
-                    archive_name = os.path.splitext(os.path.basename(latest_file))[0]
-                    extracted_folder = os.path.join(folder, f"extracted_{archive_name}")
-                    if os.path.exists(extracted_folder):
-                        try:
-                            shutil.rmtree(extracted_folder)
-                        except Exception as e:
-                            QMessageBox.warning(self, "Erro", f"Erro ao excluir {extracted_folder}: {e}")
+        if confirm != QMessageBox.Yes:
+            return
+        if self.delete_thread is not None and self.delete_thread.isRunning():
+            QMessageBox.information(self, "Atenção", "Aguarde a exclusão em andamento terminar.")
+            return
+        # Renomear é instantâneo: a extração some da pasta na hora e é apagada em segundo plano
+        targets = []
+        for folder in selected:
+            targets.extend(find_tombstones(folder))
+            latest_file = ExtractionThread().find_latest_archive(folder)
+            if latest_file:
+                archive_name = os.path.splitext(os.path.basename(latest_file))[0]
+                extracted_folder = os.path.join(folder, f"extracted_{archive_name}")
+                if os.path.exists(extracted_folder):
+                    try:
+                        targets.append(tombstone(extracted_folder))
+                    except OSError as e:
+                        QMessageBox.warning(self, "Erro", f"Erro ao excluir {extracted_folder}: {e}")
+        if not targets:
+            QMessageBox.information(self, "Atenção", "Nenhuma extração encontrada nas pastas selecionadas.")
+            return
+        self.delete_thread = DeletionThread(targets, self)
+        self.delete_thread.update_progress.connect(self.update_deletion_progress)
+        self.delete_thread.deletion_done.connect(self.deletion_complete)
+        self.cancel_delete_btn.show()
+        self.delete_thread.start()
+
+    def update_deletion_progress(self, snapshot):
+        self.status_bar.showMessage(
+            f"Excluindo extrações... {snapshot['files']} arquivo(s) removido(s) — {snapshot['current']}"
+        )
+
+    def cancel_deletion(self):
+        if self.delete_thread is not None:
+            self.delete_thread.stop()
+
+    def deletion_complete(self, summary):
+        self.cancel_delete_btn.hide()
+        if summary["cancelled"]:
+            QMessageBox.information(
+                self, "Exclusão cancelada",
+                f"{summary['files']} arquivo(s) removido(s). O restante será apagado na próxima exclusão."
+            )
+        elif summary["errors"]:
+            QMessageBox.warning(
+                self, "Erro",
+                f"{len(summary['errors'])} erro(s) ao excluir:\n" + "\n".join(summary["errors"][:10])
+            )
+        else:
             QMessageBox.information(self, "Concluído", "Extração(ões) excluída(s) com sucesso.")
+        self.status_bar.showMessage(f"{summary['files']} arquivo(s) removido(s)", 5000)
+
+
+# Benchmark: combinações (formato, compressão) e perfis de conteúdo das pastas sintéticas
+BENCHMARK_FORMATS = (
+    ("zip", "stored"), ("zip", "deflated"),
+    ("tar", "stored"), ("tar.gz", "deflated"), ("tar.xz", "deflated"), ("bz2", "deflated"),
+    ("rar", "stored"), ("rar", "deflated"),
+    ("7z", "stored"), ("7z", "deflated"),
+)
+# perfil -> (quantidade de arquivos, tamanho mínimo, tamanho máximo) na escala 1.0
+BENCHMARK_SHAPES = {
+    "pequenos": (1000, 1024, 16 * 1024),
+    "grandes": (2, 16 * 1024 * 1024, 16 * 1024 * 1024),
+}
+BENCHMARK_REGRESSION = 0.10
+
+
+def benchmark_payload(rng, size):
+    """Conteúdo reprodutível e parcialmente compressível (metade aleatória, metade texto)."""
+    # getrandbits em vez de randbytes (Python 3.9+); no 3.8 getrandbits(0) é inválido
+    half = size // 2
+    head = rng.getrandbits(8 * half).to_bytes(half, 'little') if half else b""
+    text = f"registro;{rng.randrange(10**6)};backup;".encode() * (size // 16 + 1)
+    return head + text[:size - len(head)]
+
+
+def generate_backup_tree(root, folders=len(BENCHMARK_FORMATS) * 2, seed=42, scale=1.0):
+    """Gera uma raiz de backup sintética e reprodutível para o benchmark.
+
+    Cada pasta recebe um arquivo de uma combinação de BENCHMARK_FORMATS, alternando
+    entre muitos arquivos pequenos e poucos arquivos grandes. Combinações cujo
+    compactador (rar, 7z) não está instalado são ignoradas. Retorna
+    {pasta: "formato-compressão/perfil"}.
+    """
+    rng = random.Random(seed)
+    tools = {"rar": shutil.which("rar")}
+    try:
+        tools["7z"] = find_seven_zip()
+    except Exception:
+        tools["7z"] = None
+    layout = {}
+    for i in range(folders):
+        fmt, compression = BENCHMARK_FORMATS[i % len(BENCHMARK_FORMATS)]
+        shape = "pequenos" if (i // len(BENCHMARK_FORMATS)) % 2 == 0 else "grandes"
+        if fmt in tools and not tools[fmt]:
+            continue
+        count, min_size, max_size = BENCHMARK_SHAPES[shape]
+        count = max(int(count * scale), 1) if shape == "pequenos" else count
+        sizes = [max(int(rng.randint(min_size, max_size) * (scale if shape == "grandes" else 1)), 1)
+                 for _ in range(count)]
+        folder = os.path.join(root, f"{i:02d}_{fmt}-{compression}_{shape}")
+        os.makedirs(folder, exist_ok=True)
+        archive = os.path.join(folder, f"backup.{fmt}")
+        files = [(f"dados/{n:05d}.dat", benchmark_payload(rng, size)) for n, size in enumerate(sizes)]
+
+        if fmt == "zip":
+            method = zipfile.ZIP_STORED if compression == "stored" else zipfile.ZIP_DEFLATED
+            with zipfile.ZipFile(archive, 'w', method) as zf:
+                for name, data in files:
+                    zf.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), data, method)
+        elif fmt.startswith("tar"):
+            mode = 'w:' + fmt[4:] if fmt != "tar" else 'w'
+            with tarfile.open(archive, mode) as tf:
+                for name, data in files:
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    info.mtime = 1704067200
+                    tf.addfile(info, io.BytesIO(data))
+        elif fmt == "bz2":
+            with bz2.open(archive, 'wb') as f:
+                for _, data in files:
+                    f.write(data)
+        else:
+            with tempfile.TemporaryDirectory(dir=folder) as staging:
+                for name, data in files:
+                    path = os.path.join(staging, name)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                if fmt == "rar":
+                    command = [tools["rar"], "a", "-idq", "-m0" if compression == "stored" else "-m3", archive, "dados"]
+                else:
+                    command = [tools["7z"], "a", "-bso0", "-mx=0" if compression == "stored" else "-mx=5", archive, "dados"]
+                subprocess.run(command, cwd=staging, check=True)
+        layout[folder] = f"{fmt}-{compression}/{shape}"
+    return layout
+
+
+def process_counters():
+    """Pico de RSS (MB) e syscalls de leitura/escrita do processo (quando disponíveis)."""
+    counters = {"peak_rss_mb": None, "read_syscalls": None, "write_syscalls": None}
+    try:
+        # VmHWM é o pico da imagem atual do processo; o ru_maxrss herda o do pai no fork/exec
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    counters["peak_rss_mb"] = round(int(line.split()[1]) / 1024, 1)
+    except (OSError, ValueError):
+        pass
+    if counters["peak_rss_mb"] is None and resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss vem em KB no Linux e em bytes no macOS
+        counters["peak_rss_mb"] = round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(":") for line in f)
+        counters["read_syscalls"] = int(fields["syscr"])
+        counters["write_syscalls"] = int(fields["syscw"])
+    except (OSError, KeyError, ValueError):
+        pass
+    return counters
+
+
+def measure_group(root, folders, jobs=0):
+    """Extrai um grupo do benchmark e mede o desempenho (executado em processo próprio)."""
+    extractor = ExtractionThread()
+    extractor.root_folder = root
+    extractor.selected_folders = folders
+    extractor.fixed_jobs = jobs
+    # Sem histórico: a ordem dos jobs e o ETA não podem depender de execuções anteriores
+    extractor.use_history = False
+    results = {}
+    extractor.extraction_done.connect(results.update)
+    before = process_counters()
+    start = time.perf_counter()
+    extractor.run()
+    seconds = time.perf_counter() - start
+    after = process_counters()
+    extractor.executor.shutdown()
+
+    extracted_bytes = sum(r.get("extracted_bytes", 0) for r in results.values())
+    extracted_files = sum(r.get("extracted_files", 0) for r in results.values())
+    errors = [r["message"] for r in results.values() if r["status"] == "Erro"]
+    return {
+        "seconds": round(seconds, 3),
+        "extracted_mb": round(extracted_bytes / (1024 * 1024), 2),
+        "files": extracted_files,
+        "mb_s": round(extracted_bytes / (1024 * 1024) / seconds, 2) if seconds else None,
+        "files_s": round(extracted_files / seconds, 1) if seconds else None,
+        "peak_rss_mb": after["peak_rss_mb"],
+        "read_syscalls": after["read_syscalls"] - before["read_syscalls"]
+        if before["read_syscalls"] is not None else None,
+        "write_syscalls": after["write_syscalls"] - before["write_syscalls"]
+        if before["write_syscalls"] is not None else None,
+        "errors": errors,
+    }
+
+
+def run_benchmark(root, layout, jobs=0):
+    """Extrai cada grupo (formato-compressão/perfil) sem interface e mede o desempenho.
+
+    Cada grupo roda em um processo novo (spawn), de modo que o pico de RSS
+    reflete só aquele grupo, sem a geração da árvore nem os grupos anteriores.
+    As pastas extracted_* são removidas entre os grupos para que todas as
+    medições partam do mesmo estado. As syscalls não incluem processos filhos
+    (7-Zip).
+    """
+    groups = {}
+    for folder, label in layout.items():
+        groups.setdefault(label, []).append(folder)
+    measurements = {}
+    context = multiprocessing.get_context("spawn")
+    for label, folders in sorted(groups.items()):
+        with context.Pool(1) as pool:
+            measurements[label] = pool.apply(measure_group, (root, folders, jobs))
+        for folder in folders:
+            for name in os.listdir(folder):
+                if name.startswith("extracted_"):
+                    shutil.rmtree(os.path.join(folder, name), ignore_errors=True)
+    return measurements
+
+
+def compare_benchmarks(baseline, current, threshold=BENCHMARK_REGRESSION):
+    """Linhas comparando MB/s e arquivos/s com a baseline; marca quedas acima do limite."""
+    lines = []
+    for label, data in sorted(current.items()):
+        old = baseline.get(label)
+        if not old:
+            lines.append(f"{label}: sem referência na baseline")
+            continue
+        parts = []
+        for key, name in (("mb_s", "MB/s"), ("files_s", "arquivos/s")):
+            if not old.get(key) or data.get(key) is None:
+                continue
+            change = (data[key] - old[key]) / old[key]
+            flag = " ⚠️ REGRESSÃO" if change < -threshold else ""
+            parts.append(f"{name} {old[key]} → {data[key]} ({change:+.0%}){flag}")
+        lines.append(f"{label}: " + "; ".join(parts))
+    return lines
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_cli(argv):
+    """Modo linha de comando (sem interface gráfica)."""
+    parser = argparse.ArgumentParser(description="Extrator de Backups")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    # Opções de extração compartilhadas por "extrair" e "servico"
+    extraction = argparse.ArgumentParser(add_help=False)
+    extraction.add_argument("raiz")
+    extraction.add_argument("--senha", default="")
+    extraction.add_argument("--incluir", default="", help="Padrões a incluir (ex.: '*.sql;*.bak')")
+    extraction.add_argument("--excluir", default="", help="Padrões a excluir")
+    extraction.add_argument("--incremental", action="store_true")
+    extraction.add_argument("--aninhados", type=int, default=0, help="Níveis de arquivos aninhados a extrair")
+    extraction.add_argument("--jobs", type=int, default=0, help="Extrações simultâneas (0 = ajuste automático)")
+    extraction.add_argument("--limite", default="", help="Limite de E/S por horário (ex.: '08:00-18:00=50/500')")
+    extraction.add_argument("--prioridade", choices=list(PRIORITY_PROFILES), default=DEFAULT_PRIORITY)
+    extraction.add_argument("--cpus", default="", help="CPUs dedicadas à extração (ex.: '0-3,6')")
+    extraction.add_argument("--ultimos", type=int, default=1, help="Quantidade de arquivos mais recentes por pasta")
+    extraction.add_argument("--desde", default="", help="Extrai todos os arquivos desde a data (AAAA-MM-DD [HH:MM])")
+    extraction.add_argument("--metricas-arquivo", default=None,
+                            help="Grava métricas para o textfile collector (ex.: /var/lib/node_exporter/extrator.prom)")
+    extraction.add_argument("--retencao", default="",
+                            help="Retenção das pastas extracted_* (ex.: 'manter=3; dias=30; orcamento=200GB')")
+    extraction.add_argument("--resultados", default=None,
+                            help="Caminho base dos resultados por pasta (gera .jsonl e .csv, anexados a cada job)")
+    extraction.add_argument("--trace", default=None, help="Grava as etapas de cada extração em JSON (Chrome trace)")
+    extraction.add_argument("--perfil", choices=list(PROFILE_MODES), default="desligado",
+                            help="Perfila cada extração (.pstats ou .collapsed em perfis_extracao/)")
+    extraction.add_argument("--sem-historico", action="store_true",
+                            help="Não usa nem grava o histórico de execuções (agendamento e tempo restante)")
+
+    sub.add_parser("extrair", parents=[extraction], help="Extrai o arquivo mais recente de cada pasta")
+
+    p_daemon = sub.add_parser("servico", parents=[extraction], help="Extrai periodicamente e expõe métricas via HTTP")
+    p_daemon.add_argument("--intervalo", type=float, default=60, help="Minutos entre execuções")
+    p_daemon.add_argument("--metricas-porta", type=int, default=9464, help="Porta do endpoint /metrics")
+
+    p_index = sub.add_parser("indice", help="Lista o conteúdo do arquivo mais recente da pasta")
+    p_index.add_argument("pasta")
+    p_index.add_argument("--senha", default="")
+    p_index.add_argument("--filtro", default="")
+
+    p_get = sub.add_parser("obter", help="Extrai membros específicos do arquivo mais recente")
+    p_get.add_argument("pasta")
+    p_get.add_argument("membros", nargs="+")
+    p_get.add_argument("--senha", default="")
+    p_get.add_argument("--destino", default=None)
+
+    p_bench = sub.add_parser("benchmark", help="Gera uma raiz sintética e mede a extração por formato")
+    p_bench.add_argument("raiz", help="Pasta onde a raiz sintética é gerada (reaproveitada se já existir)")
+    p_bench.add_argument("--pastas", type=int, default=len(BENCHMARK_FORMATS) * 2)
+    p_bench.add_argument("--semente", type=int, default=42)
+    p_bench.add_argument("--escala", type=float, default=1.0, help="Multiplicador do volume de dados gerado")
+    p_bench.add_argument("--jobs", type=int, default=0, help="Extrações simultâneas (0 = ajuste automático)")
+    p_bench.add_argument("--saida", default="benchmark.json", help="Arquivo JSON com os resultados")
+    p_bench.add_argument("--comparar", default=None, help="Baseline JSON de outro commit para comparação")
+
+    p_history = sub.add_parser("historico", help="Tendências por pasta a partir do histórico de execuções")
+    p_history.add_argument("raiz")
+    p_history.add_argument("--dias", type=int, default=HISTORY_WINDOW_DAYS, help="Janela de análise em dias")
+    p_history.add_argument("--limiar", type=float, default=HISTORY_THRESHOLD,
+                           help="Variação relativa que gera alerta (0.25 = 25%%)")
+    p_history.add_argument("--alertas", action="store_true", help="Mostra apenas pastas com alerta")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "historico":
+        db_path = os.path.join(args.raiz, HISTORY_DB_NAME)
+        if not os.path.exists(db_path):
+            print(f"Nenhum histórico em {db_path}")
+            return 1
+        history = RunHistory(db_path)
+        trends = history.trends(args.dias, args.limiar)
+        history.close()
+        flagged = 0
+        for entry in trends:
+            if args.alertas and not entry["alerts"]:
+                continue
+            flagged += bool(entry["alerts"])
+            line = (f"{entry['folder']}: {entry['runs']} execução(ões), "
+                    f"{entry['size']/(1024*1024):.1f} MB em {entry['seconds']:.1f}s ({entry['mb_s']:.1f} MB/s)")
+            if "median_mb_s" in entry:
+                line += (f" — mediana anterior {entry['median_size']/(1024*1024):.1f} MB, "
+                         f"{entry['median_seconds']:.1f}s, {entry['median_mb_s']:.1f} MB/s")
+            if entry["alerts"]:
+                line += " ⚠️ " + ", ".join(entry["alerts"])
+            print(line)
+        print(f"{len(trends)} pasta(s) nos últimos {args.dias} dia(s), {flagged} com alerta")
+        return 0
+
+    if args.command == "benchmark":
+        layout_file = os.path.join(args.raiz, "benchmark_layout.json")
+        settings = {"pastas": args.pastas, "semente": args.semente, "escala": args.escala}
+        layout = None
+        if os.path.exists(layout_file):
+            with open(layout_file, encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get("settings") == settings:
+                layout = saved["layout"]
+        if layout is None:
+            print("Gerando raiz sintética...")
+            layout = generate_backup_tree(args.raiz, args.pastas, args.semente, args.escala)
+            with open(layout_file, 'w', encoding='utf-8') as f:
+                json.dump({"settings": settings, "layout": layout}, f, indent=2)
+        measurements = run_benchmark(args.raiz, layout, args.jobs)
+        report = {
+            "commit": current_commit(),
+            "date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": multiprocessing.cpu_count(),
+            "settings": settings,
+            "formats": measurements,
+        }
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        for label, data in sorted(measurements.items()):
+            print(f"{label}: {data['mb_s']} MB/s, {data['files_s']} arquivos/s, "
+                  f"pico {data['peak_rss_mb']} MB, syscalls r/w {data['read_syscalls']}/{data['write_syscalls']}"
+                  + (f" — {len(data['errors'])} erro(s)" if data['errors'] else ""))
+        if args.comparar:
+            with open(args.comparar, encoding='utf-8') as f:
+                baseline = json.load(f)
+            print(f"\nComparação com {baseline.get('commit') or args.comparar}:")
+            for line in compare_benchmarks(baseline.get("formats", {}), measurements):
+                print(line)
+        print(f"Resultados salvos em: {args.saida}")
+        return 1 if any(data['errors'] for data in measurements.values()) else 0
+
+    extractor = ExtractionThread()
+    extractor.password = args.senha
+    # Sem laço de eventos no modo CLI: os sinais emitidos pelos jobs são entregues direto
+    extractor.update_status.connect(print, Qt.DirectConnection)
+
+    if args.command in ("extrair", "servico"):
+        extractor.root_folder = args.raiz
+        extractor.include_patterns = parse_patterns(args.incluir)
+        extractor.exclude_patterns = parse_patterns(args.excluir)
+        extractor.incremental = args.incremental
+        extractor.nested_depth = args.aninhados
+        extractor.archive_count = args.ultimos
+        extractor.fixed_jobs = args.jobs
+        extractor.priority = args.prioridade
+        try:
+            extractor.archives_since = parse_since(args.desde)
+            extractor.limiter = RateLimiter(parse_schedule(args.limite))
+            extractor.cpu_affinity = parse_cpu_list(args.cpus)
+            extractor.retention = parse_retention(args.retencao)
+        except ValueError as e:
+            parser.error(str(e))
+        extractor.metrics_file = args.metricas_arquivo
+        extractor.trace_file = args.trace
+        extractor.results_file = args.resultados
+        extractor.profile_mode = args.perfil
+        extractor.use_history = not args.sem_historico
+        results = {}
+        extractor.extraction_done.connect(results.update)
+
+        if args.command == "servico":
+            start_metrics_server(extractor.metrics, args.metricas_porta)
+            print(f"Métricas em http://0.0.0.0:{args.metricas_porta}/metrics")
+            while True:
+                results.clear()
+                extractor.run()
+                errors = sum(1 for r in results.values() if r['status'] == 'Erro')
+                print(f"{datetime.now():%Y-%m-%d %H:%M:%S} - {len(results)} pasta(s), {errors} erro(s)")
+                time.sleep(args.intervalo * 60)
+
+        extractor.run()
+        for folder, data in results.items():
+            print(f"{data['status']}: {folder} - {data['message']} ({data.get('processing_time', 'N/A')})")
+            if data.get('stages'):
+                print(f"    {format_stages(data['stages'])}")
+        return 1 if any(r['status'] == 'Erro' for r in results.values()) else 0
+
+    latest_file = extractor.find_latest_archive(args.pasta)
+    if not latest_file:
+        print("Nenhum arquivo compactado encontrado.")
+        return 1
+
+    if args.command == "indice":
+        patterns = parse_patterns(args.filtro)
+        for entry in extractor.build_index(latest_file):
+            if patterns and not matches_patterns(entry["name"], patterns, []):
+                continue
+            size = entry.get("size")
+            print(f"{size if size is not None else '-':>14}  {entry['name']}")
+        return 0
+
+    archive_name = os.path.splitext(os.path.basename(latest_file))[0]
+    output_folder = args.destino or os.path.join(args.pasta, f"extracted_{archive_name}")
+    try:
+        extractor.extract_members(latest_file, output_folder, args.membros)
+    except Exception as e:
+        print(f"Erro: {e}")
+        return 1
+    print(f"{len(args.membros)} arquivo(s) extraído(s) em {output_folder}")
+    return 0
+
 
 if __name__ == "__main__":
     try:
@@ -835,6 +4149,9 @@ if __name__ == "__main__":
         print("Erro: Instale rarfile com: pip install rarfile")
         sys.exit(1)
 
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setStyleSheet(APP_STYLE)